@@ -1,10 +1,58 @@
+from typing import Dict, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Config(BaseSettings):
     openai_api_key: str = ""
     gpt_model: str = "gpt-4o-mini"
+    long_context_model: Optional[str] = None
+    max_prompt_tokens: int = 120000
+    over_budget_action: str = "chunk"
+    estimated_completion_tokens: int = 1000
+    # Dollars per million tokens; the longest model-name prefix matches dated snapshots.
+    model_pricing: Dict[str, Dict[str, float]] = {
+        "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+        "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+        "gpt-4.1-nano": {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+        "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+        "gpt-4.1": {"input": 2.00, "cached_input": 0.50, "output": 8.00},
+    }
+    openai_base_url: Optional[str] = None
+    openai_timeout: float = 120.0
+    openai_max_concurrency: int = 16
+    openai_requests_per_minute: int = 500
+    openai_tokens_per_minute: int = 200000
     fireflies_api_key: str = ""
+    fireflies_url: str = "https://api.fireflies.ai/graphql"
+    fireflies_timeout: float = 30.0
+    fireflies_max_connections: int = 100
+    fireflies_max_keepalive_connections: int = 20
+    fireflies_requests_per_minute: int = 60
+    upstream_max_retries: int = 5
+    upstream_backoff_base_seconds: float = 0.5
+    upstream_backoff_max_seconds: float = 30.0
+    transcript_cache_max_bytes: int = 256 * 1024 * 1024
+    transcript_cache_ttl_seconds: float = 7 * 24 * 60 * 60
+    transcript_cache_dir: Optional[str] = None
+    result_cache_backend: str = "memory"
+    result_cache_max_entries: int = 1024
+    result_cache_path: str = "result_cache.sqlite3"
+    batch_max_concurrency: int = 8
+    chunk_threshold_tokens: int = 12000
+    chunk_max_tokens: int = 6000
+    compact_transcripts: bool = False
+    compact_strip_fillers: bool = False
+    compact_markers: Optional[str] = None
+    job_workers: int = 4
+    job_db_path: str = "jobs.sqlite3"
+    job_max_attempts: int = 3
+    job_lease_seconds: float = 60
+    fireflies_webhook_secret: str = ""
+    webhook_max_backlog: int = 100
+    transcript_index_path: str = "transcripts.sqlite3"
+    transcript_sync_interval_seconds: float = 60
+    extraction_store_path: str = "extractions.sqlite3"
+    cost_log_dir: str = "/logs"
     model_config = SettingsConfigDict(env_file=".env", env_ignore_empty=True)
 
 
@@ -1,12 +1,45 @@
 from fastapi import FastAPI
-from app.routers import fireflies
+from contextlib import asynccontextmanager
+from app.routers import candidates, fireflies, jobs, metrics, webhooks
 from fastapi.middleware.cors import CORSMiddleware
+from app.utils.metrics.instrumentation import TimedJSONResponse
+from app.utils.cache.transcript_cache import init_transcript_cache
+from app.utils.jobs.worker import start_job_workers, stop_job_workers
+from app.utils.cache.result_cache import init_result_cache
+from app.utils.fireflies.transcript_index import init_transcript_index
+from app.utils.fireflies.extraction_store import init_extraction_store
+from app.utils.llm.client import init_openai_client, close_openai_client
+from app.utils.cost.compute import init_cost_logger, close_cost_logger
+from app.utils.fireflies.client import init_fireflies_client, close_fireflies_client
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_fireflies_client()
+    init_transcript_cache()
+    init_openai_client()
+    init_cost_logger()
+    init_result_cache()
+    init_transcript_index()
+    init_extraction_store()
+    await start_job_workers()
+    yield
+    await stop_job_workers()
+    await close_openai_client()
+    close_cost_logger()
+    await close_fireflies_client()
+
 
 app = FastAPI(
     title="Firefly Interview ATS Mapping",
     openapi_tags=[
         {"name": "Firefly"},
+        {"name": "Jobs"},
+        {"name": "Webhooks"},
+        {"name": "Candidates"},
     ],
+    lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 app.add_middleware(
@@ -19,4 +52,8 @@ app.add_middleware(
 
 route = "/api/v1"
 
+app.include_router(metrics.router, tags=["Metrics"])
 app.include_router(fireflies.router, prefix=f"{route}/fireflies", tags=["Firefly"])
+app.include_router(jobs.router, prefix=f"{route}/jobs", tags=["Jobs"])
+app.include_router(webhooks.router, prefix=f"{route}/webhooks", tags=["Webhooks"])
+app.include_router(candidates.router, prefix=f"{route}/candidates", tags=["Candidates"])
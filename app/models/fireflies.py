@@ -1,9 +1,84 @@
-from pydantic import BaseModel
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
 
 
 class FireflyRequest(BaseModel):
     userId: str
 
 
+class TranscriptListRequest(FireflyRequest):
+    limit: int = Field(default=50, ge=1, le=500)
+    skip: int = Field(default=0, ge=0)
+    fromDate: Optional[datetime] = None
+    toDate: Optional[datetime] = None
+    refresh: bool = False
+
+    @field_validator("fromDate", "toDate")
+    @classmethod
+    def assume_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """
+        Reads dates without a timezone as UTC rather than the server's local time.
+        """
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+
 class TranscriptionRequest(BaseModel):
     transcriptId: str
+
+
+SentenceField = Literal[
+    "index",
+    "speaker_name",
+    "speaker_id",
+    "text",
+    "raw_text",
+    "start_time",
+    "end_time",
+]
+
+CandidateField = Literal[
+    "name",
+    "position",
+    "age",
+    "desired_salary",
+    "current_salary",
+    "desired_position",
+    "desired_company",
+    "desired_location",
+    "personality_assessment",
+    "date_of_birth",
+    "basic_summary",
+    "pitched_jobs",
+    "notice_period",
+    "contact_preference",
+    "additional_info",
+]
+
+
+class TranscriptMessagesRequest(TranscriptionRequest):
+    fields: Optional[List[SentenceField]] = None
+
+
+class ExtractionRequest(TranscriptionRequest):
+    fields: Optional[List[CandidateField]] = None
+    includeSnippets: bool = True
+
+
+class SnippetAlignmentRequest(TranscriptionRequest):
+    snippets: List[str]
+
+
+class ParseTranscriptRequest(TranscriptionRequest):
+    compact: bool = False
+    stripFillers: bool = False
+    markers: Optional[Literal["index", "start_time"]] = None
+
+
+class BatchExtractionRequest(BaseModel):
+    transcriptIds: List[str] = []
+    userId: Optional[str] = None
+    fields: Optional[List[CandidateField]] = None
+    includeSnippets: bool = True
@@ -0,0 +1,7 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class JobRequest(BaseModel):
+    transcriptId: str
+    operation: Literal["extract_information", "extract_cheat_sheet", "analyze"]
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+TRANSCRIPTION_COMPLETED = "Transcription completed"
+
+
+class FirefliesWebhookEvent(BaseModel):
+    meetingId: str
+    eventType: str
+    clientReferenceId: Optional[str] = None
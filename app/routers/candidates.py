@@ -0,0 +1,68 @@
+import asyncio
+
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.utils.metrics.instrumentation import track_endpoint
+from app.utils.fireflies.extraction_store import ExtractionStore, get_extraction_store
+
+router = APIRouter(dependencies=[Depends(track_endpoint)])
+
+
+@router.get("")
+async def search_candidates(
+    name: Optional[str] = None,
+    desiredPosition: Optional[str] = None,
+    desiredLocation: Optional[str] = None,
+    desiredSalary: Optional[str] = None,
+    minNoticeDays: Optional[float] = None,
+    maxNoticeDays: Optional[float] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    skip: int = Query(default=0, ge=0),
+    store: ExtractionStore = Depends(get_extraction_store),
+):
+    candidates, total = await asyncio.to_thread(
+        store.search_candidates,
+        limit,
+        skip,
+        name=name,
+        desired_position=desiredPosition,
+        desired_location=desiredLocation,
+        desired_salary=desiredSalary,
+        min_notice_days=minNoticeDays,
+        max_notice_days=maxNoticeDays,
+    )
+    return {"candidates": candidates, "total": total, "limit": limit, "skip": skip}
+
+
+@router.get("/cheat-sheet-questions")
+async def search_cheat_sheet_questions(
+    subcategory: Optional[str] = None,
+    question: Optional[str] = None,
+    isAnswered: Optional[bool] = None,
+    transcriptId: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    skip: int = Query(default=0, ge=0),
+    store: ExtractionStore = Depends(get_extraction_store),
+):
+    questions, total = await asyncio.to_thread(
+        store.search_questions,
+        limit,
+        skip,
+        subcategory=subcategory,
+        question=question,
+        is_answered=isAnswered,
+        transcript_id=transcriptId,
+    )
+    return {"questions": questions, "total": total, "limit": limit, "skip": skip}
+
+
+@router.get("/{transcript_id}")
+async def get_candidate(
+    transcript_id: str, store: ExtractionStore = Depends(get_extraction_store)
+):
+    extraction = await asyncio.to_thread(store.get, transcript_id)
+    if extraction is None:
+        raise HTTPException(
+            status_code=404, detail="No extraction stored for transcript"
+        )
+    return extraction
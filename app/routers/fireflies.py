@@ -1,52 +1,81 @@
 import json
-import requests
+import time
+import asyncio
 
 from app.config import config
-from fastapi import APIRouter, HTTPException
-from app.utils.fireflies.fetch_messages import fetch_transcript
-from app.utils.fireflies.parse_transcript import parse_transcript
-from app.utils.fireflies.extract_cheat_sheet import extract_cheat_sheet
-from app.models.fireflies import FireflyRequest, TranscriptionRequest
+from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException
+from app.utils.fireflies.fetch_messages import (
+    SENTENCE_FIELDS,
+    fetch_transcript,
+    fetch_transcripts,
+    project_transcript,
+)
+from app.utils.fireflies.client import FirefliesClient, get_fireflies_client
+from app.utils.metrics.telemetry import prompt_cache_stats as get_prompt_cache_stats
+from app.utils.metrics.instrumentation import TimedJSONResponse, track_endpoint
+from app.utils.cache.result_cache import get_result_cache
+from app.utils.fireflies.extraction_store import (
+    store_candidate_information,
+    store_cheat_sheet,
+)
+from app.utils.fireflies.transcript_index import (
+    TranscriptIndex,
+    get_transcript_index,
+    sync_transcripts,
+)
+from app.utils.cache.transcript_cache import TranscriptCache, get_transcript_cache
+from app.utils.fireflies.parse_transcript import (
+    parse_transcript,
+    parse_transcript_compact,
+    render_fields,
+    render_transcript,
+    transcript_render_fields,
+)
+from app.utils.fireflies.analyze_transcript import analyze_transcript
+from app.utils.fireflies.align_snippets import (
+    ALIGNMENT_FIELDS,
+    align_candidate_snippets,
+    get_alignment_index,
+)
+from app.utils.fireflies.extract_cheat_sheet import extract_cheat_sheet_async
+from app.utils.fireflies.batch_extract import batch_extract_information
+from app.models.fireflies import (
+    BatchExtractionRequest,
+    ExtractionRequest,
+    FireflyRequest,
+    ParseTranscriptRequest,
+    SnippetAlignmentRequest,
+    TranscriptionRequest,
+    TranscriptListRequest,
+    TranscriptMessagesRequest,
+)
 from app.utils.fireflies.extract_candidate_information import (
-    extract_candidate_information,
+    extract_candidate_information_async,
+    project_candidate_information,
 )
 
-url = "https://api.fireflies.ai/graphql"
-default_headers = {"Content-Type": "application/json"}
-
 # user id: E08oX1s7um
 # transcript id: U2W1tF8zK9qE2iAw
 
-firefly_api_key = config.fireflies_api_key
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(track_endpoint)])
 
 
 @router.get("/health-check")
 def health_check():
-    return {"firefly_api_key": firefly_api_key}
+    return {"firefly_api_key": config.fireflies_api_key}
 
 
 @router.post("/get-user")
-async def get_users():
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {firefly_api_key}",
-    }
-
-    data = {"query": "{ users { name user_id } }"}
-    response = requests.post(url, json=data, headers=headers)
-    if response.status_code != 200:
-        raise HTTPException(status_code=response.status_code, detail=response.text)
-    return response.json()
+async def get_users(client: FirefliesClient = Depends(get_fireflies_client)):
+    return await client.execute("{ users { name user_id } }")
 
 
 @router.post("/get-transcriptions")
-async def get_transcriptions(request: FireflyRequest):
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {firefly_api_key}",
-    }
-
+async def get_transcriptions(
+    request: FireflyRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+):
     payload_str = request.model_dump_json()
     try:
         payload = json.loads(payload_str)
@@ -57,21 +86,49 @@ async def get_transcriptions(request: FireflyRequest):
 
     if "userId" in payload:
         user_id = payload["userId"]
-        data = {
-            "query": "query Transcripts($userId: String) { transcripts(user_id: $userId) { title id } }",
-            "variables": {"userId": user_id},
-        }
-
-        response = requests.post(url, json=data, headers=headers)
-        if response.status_code != 200:
-            raise HTTPException(status_code=response.status_code, detail=response.text)
-        return response.json()
+        return await fetch_transcripts(user_id, client)
     else:
         raise HTTPException(status_code=400, detail="userId is missing in the payload")
 
 
+@router.post("/list-transcriptions")
+async def list_transcriptions(
+    request: TranscriptListRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    index: TranscriptIndex = Depends(get_transcript_index),
+):
+    state = await asyncio.to_thread(index.sync_state, request.userId)
+    synced = 0
+    if (
+        request.refresh
+        or state is None
+        or time.time() - state["synced_at"] > config.transcript_sync_interval_seconds
+    ):
+        synced = await sync_transcripts(request.userId, client, index)
+
+    transcripts, total = await asyncio.to_thread(
+        index.list,
+        request.userId,
+        request.limit,
+        request.skip,
+        request.fromDate.timestamp() * 1000 if request.fromDate else None,
+        request.toDate.timestamp() * 1000 if request.toDate else None,
+    )
+    return {
+        "transcripts": transcripts,
+        "total": total,
+        "limit": request.limit,
+        "skip": request.skip,
+        "synced": synced,
+    }
+
+
 @router.post("/get-transcription-messages")
-async def get_transcript_messages(request: TranscriptionRequest):
+async def get_transcript_messages(
+    request: TranscriptMessagesRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
     payload_str = request.model_dump_json()
     try:
         payload = json.loads(payload_str)
@@ -82,7 +139,12 @@ async def get_transcript_messages(request: TranscriptionRequest):
 
     if "transcriptId" in payload:
         transcript_id = payload["transcriptId"]
-        return fetch_transcript(transcript_id, url, firefly_api_key)
+        fields = request.fields or SENTENCE_FIELDS
+        transcript_data = await fetch_transcript(
+            transcript_id, client, cache, fields=fields
+        )
+        # Plain JSON already; returning the response directly skips jsonable_encoder.
+        return TimedJSONResponse(project_transcript(transcript_data, fields))
     else:
         raise HTTPException(
             status_code=400, detail="transcriptId is missing in the payload"
@@ -90,7 +152,11 @@ async def get_transcript_messages(request: TranscriptionRequest):
 
 
 @router.post("/parse-transcript")
-async def parse_transcription(request: TranscriptionRequest):
+async def parse_transcription(
+    request: ParseTranscriptRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
     payload_str = request.model_dump_json()
     try:
         payload = json.loads(payload_str)
@@ -101,9 +167,25 @@ async def parse_transcription(request: TranscriptionRequest):
 
     if "transcriptId" in payload:
         transcript_id = payload["transcriptId"]
-        transcript_data = fetch_transcript(transcript_id, url, firefly_api_key)
-        parsed_transcript = parse_transcript(transcript_data)
-        return {"parsed_transcript": parsed_transcript}
+        transcript_data = await fetch_transcript(
+            transcript_id,
+            client,
+            cache,
+            fields=render_fields(request.markers if request.compact else None),
+        )
+        if not request.compact:
+            return {"parsed_transcript": parse_transcript(transcript_data)}
+
+        compact = parse_transcript_compact(
+            transcript_data, strip_fillers=request.stripFillers, markers=request.markers
+        )
+        return {
+            "parsed_transcript": compact.text,
+            "original_tokens": compact.original_tokens,
+            "compact_tokens": compact.compact_tokens,
+            "saved_tokens": compact.saved_tokens,
+            "saved_ratio": compact.saved_ratio,
+        }
     else:
         raise HTTPException(
             status_code=400, detail="transcriptId is missing in the payload"
@@ -111,7 +193,11 @@ async def parse_transcription(request: TranscriptionRequest):
 
 
 @router.post("/extract-information")
-async def extract_information(request: TranscriptionRequest):
+async def extract_information(
+    request: ExtractionRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
     payload_str = request.model_dump_json()
     try:
         payload = json.loads(payload_str)
@@ -122,10 +208,27 @@ async def extract_information(request: TranscriptionRequest):
 
     if "transcriptId" in payload:
         transcript_id = payload["transcriptId"]
-        transcript_data = fetch_transcript(transcript_id, url, firefly_api_key)
-        parsed_transcript = parse_transcript(transcript_data)
-        extracted_information = extract_candidate_information(parsed_transcript)
-        return {"extracted_information": extracted_information}
+        transcript_data = await fetch_transcript(
+            transcript_id,
+            client,
+            cache,
+            fields=transcript_render_fields() + ALIGNMENT_FIELDS,
+        )
+        parsed_transcript = render_transcript(transcript_data)
+        result = await extract_candidate_information_async(parsed_transcript)
+        await store_candidate_information(transcript_id, result.parsed)
+        alignment_index = get_alignment_index(transcript_id, transcript_data)
+        return {
+            "extracted_information": project_candidate_information(
+                result.parsed, request.fields, request.includeSnippets
+            ),
+            "provenance": align_candidate_snippets(
+                result.parsed, alignment_index, request.fields
+            ),
+            "model": result.model,
+            "estimated_cost": result.estimated_cost,
+            "cost": result.cost,
+        }
     else:
         raise HTTPException(
             status_code=400, detail="transcriptId is missing in the payload"
@@ -133,7 +236,11 @@ async def extract_information(request: TranscriptionRequest):
 
 
 @router.post("/extract-cheat-sheet")
-async def extract_cheatsheet(request: TranscriptionRequest):
+async def extract_cheatsheet(
+    request: TranscriptionRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
     payload_str = request.model_dump_json()
     try:
         payload = json.loads(payload_str)
@@ -144,11 +251,125 @@ async def extract_cheatsheet(request: TranscriptionRequest):
 
     if "transcriptId" in payload:
         transcript_id = payload["transcriptId"]
-        transcript_data = fetch_transcript(transcript_id, url, firefly_api_key)
-        parsed_transcript = parse_transcript(transcript_data)
-        extracted_cheat_sheet = extract_cheat_sheet(parsed_transcript)
-        return {"extracted_cheat_sheet": extracted_cheat_sheet}
+        transcript_data = await fetch_transcript(
+            transcript_id, client, cache, fields=transcript_render_fields()
+        )
+        parsed_transcript = render_transcript(transcript_data)
+        result = await extract_cheat_sheet_async(parsed_transcript)
+        await store_cheat_sheet(transcript_id, result.parsed)
+        return {
+            "extracted_cheat_sheet": result.parsed,
+            "model": result.model,
+            "estimated_cost": result.estimated_cost,
+            "cost": result.cost,
+        }
     else:
         raise HTTPException(
             status_code=400, detail="transcriptId is missing in the payload"
         )
+
+
+@router.post("/align-snippets")
+async def align_snippets(
+    request: SnippetAlignmentRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
+    transcript_data = await fetch_transcript(
+        request.transcriptId, client, cache, fields=ALIGNMENT_FIELDS
+    )
+    alignment_index = get_alignment_index(request.transcriptId, transcript_data)
+    return {
+        "alignments": [alignment_index.align(snippet) for snippet in request.snippets]
+    }
+
+
+@router.post("/analyze-transcript")
+async def analyze_transcription(
+    request: ExtractionRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
+    payload_str = request.model_dump_json()
+    try:
+        payload = json.loads(payload_str)
+    except json.JSONDecodeError:
+        raise HTTPException(
+            status_code=400, detail="Invalid JSON format in the request payload."
+        )
+
+    if "transcriptId" in payload:
+        transcript_id = payload["transcriptId"]
+        return await analyze_transcript(
+            transcript_id,
+            client,
+            cache,
+            fields=request.fields,
+            include_snippets=request.includeSnippets,
+        )
+    else:
+        raise HTTPException(
+            status_code=400, detail="transcriptId is missing in the payload"
+        )
+
+
+@router.post("/batch-extract-information")
+async def batch_extract(
+    request: BatchExtractionRequest,
+    client: FirefliesClient = Depends(get_fireflies_client),
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
+    transcript_ids = list(request.transcriptIds)
+    if request.userId:
+        transcripts = await fetch_transcripts(request.userId, client)
+        transcript_ids += [
+            transcript["id"]
+            for transcript in (transcripts.get("data") or {}).get("transcripts") or []
+        ]
+
+    if not transcript_ids:
+        raise HTTPException(
+            status_code=400, detail="transcriptIds or userId is missing in the payload"
+        )
+
+    async def stream_results():
+        async for result in batch_extract_information(
+            transcript_ids,
+            client,
+            cache,
+            config.batch_max_concurrency,
+            fields=request.fields,
+            include_snippets=request.includeSnippets,
+        ):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@router.get("/transcript-cache/stats")
+async def transcript_cache_stats(
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
+    return cache.stats()
+
+
+@router.delete("/transcript-cache/{transcript_id}")
+async def invalidate_transcript_cache(
+    transcript_id: str,
+    cache: TranscriptCache = Depends(get_transcript_cache),
+):
+    await cache.invalidate(transcript_id)
+    return {"invalidated": transcript_id}
+
+
+@router.get("/result-cache/stats")
+async def result_cache_stats():
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/prompt-cache/stats")
+async def prompt_cache_stats():
+    return get_prompt_cache_stats()
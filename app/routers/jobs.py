@@ -0,0 +1,77 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from app.models.jobs import JobRequest
+from app.utils.jobs.store import TERMINAL_STATUSES
+from app.utils.jobs.worker import JobWorkerPool, get_job_pool
+from app.utils.metrics.instrumentation import track_endpoint
+
+router = APIRouter(dependencies=[Depends(track_endpoint)])
+
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _job_status(job: dict) -> dict:
+    return {
+        "jobId": job["id"],
+        "transcriptId": job["transcript_id"],
+        "operation": job["operation"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+
+async def _get_job_or_404(job_id: str, pool: JobWorkerPool) -> dict:
+    job = await pool.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", status_code=202)
+async def submit_job(request: JobRequest, pool: JobWorkerPool = Depends(get_job_pool)):
+    job = await pool.submit(request.transcriptId, request.operation)
+    return _job_status(job)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str, pool: JobWorkerPool = Depends(get_job_pool)):
+    return _job_status(await _get_job_or_404(job_id, pool))
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, pool: JobWorkerPool = Depends(get_job_pool)):
+    job = await _get_job_or_404(job_id, pool)
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return job["result"]
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, pool: JobWorkerPool = Depends(get_job_pool)):
+    await _get_job_or_404(job_id, pool)
+
+    async def events():
+        last_seq = 0
+        while True:
+            seen = pool.version(job_id)
+            for event in await pool.events_since(job_id, last_seq):
+                last_seq = event["seq"]
+                yield f"id: {event['seq']}\nevent: stage\ndata: {json.dumps(event)}\n\n"
+
+            job = await pool.get(job_id)
+            if job["status"] in TERMINAL_STATUSES:
+                yield f"event: {job['status']}\ndata: {json.dumps(_job_status(job))}\n\n"
+                return
+
+            if not await pool.wait_for_change(job_id, seen, SSE_KEEPALIVE_SECONDS):
+                yield ": keepalive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
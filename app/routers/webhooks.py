@@ -0,0 +1,61 @@
+import hmac
+import hashlib
+
+from app.config import config
+from pydantic import ValidationError
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.utils.jobs.worker import JobWorkerPool, get_job_pool
+from app.utils.metrics.instrumentation import track_endpoint
+from app.models.webhooks import TRANSCRIPTION_COMPLETED, FirefliesWebhookEvent
+
+router = APIRouter(dependencies=[Depends(track_endpoint)])
+
+
+def verify_signature(body: bytes, signature: str, secret: str) -> bool:
+    """
+    Checks the hex HMAC-SHA256 signature Fireflies sends in the x-hub-signature header.
+    """
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    signature = signature.removeprefix("sha256=")
+    return hmac.compare_digest(expected, signature)
+
+
+@router.post("/fireflies")
+async def fireflies_webhook(
+    request: Request, pool: JobWorkerPool = Depends(get_job_pool)
+):
+    if not config.fireflies_webhook_secret:
+        raise HTTPException(
+            status_code=503, detail="Fireflies webhook secret is not configured"
+        )
+
+    body = await request.body()
+    signature = request.headers.get("x-hub-signature", "")
+    if not verify_signature(body, signature, config.fireflies_webhook_secret):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        event = FirefliesWebhookEvent.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if event.eventType != TRANSCRIPTION_COMPLETED:
+        return {"status": "ignored", "eventType": event.eventType}
+
+    job, created = await pool.submit_once(
+        f"webhook:{event.meetingId}",
+        event.meetingId,
+        "analyze",
+        max_pending=config.webhook_max_backlog,
+    )
+    if job is None:
+        raise HTTPException(
+            status_code=429,
+            detail="Webhook backlog is full",
+            headers={"Retry-After": "60"},
+        )
+    return {
+        "status": "queued" if created else "duplicate",
+        "jobId": job["id"],
+        "transcriptId": event.meetingId,
+    }
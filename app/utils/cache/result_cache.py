@@ -0,0 +1,143 @@
+import json
+import time
+import sqlite3
+import asyncio
+import hashlib
+import threading
+
+from typing import List, Optional, Type
+from collections import OrderedDict
+from pydantic import BaseModel
+from app.config import config
+
+
+class MemoryResultBackend:
+    """
+    In-memory LRU store of serialized extraction results.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SQLiteResultBackend:
+    """
+    Local SQLite store of serialized extraction results that survives restarts.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            self._conn.commit()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of structured completion results.
+
+    The key hashes the model, the response schema and the full rendered prompt, so
+    changing the model, the question sets or the transcript yields a new key.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._offload = isinstance(backend, SQLiteResultBackend)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(
+        model: str, response_format: Type[BaseModel], messages: List[dict]
+    ) -> str:
+        material = json.dumps(
+            {
+                "model": model,
+                "schema": response_format.model_json_schema(),
+                "messages": messages,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    async def get(
+        self, key: str, response_format: Type[BaseModel]
+    ) -> Optional[BaseModel]:
+        if self._offload:
+            value = await asyncio.to_thread(self.backend.get, key)
+        else:
+            value = self.backend.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return response_format.model_validate_json(value)
+
+    async def set(self, key: str, result: BaseModel):
+        value = result.model_dump_json()
+        if self._offload:
+            await asyncio.to_thread(self.backend.set, key, value)
+        else:
+            self.backend.set(key, value)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[ResultCache] = None
+
+
+def init_result_cache(backend: Optional[str] = None) -> Optional[ResultCache]:
+    """
+    Builds the result cache for the configured backend: "memory", "sqlite" or "none".
+    """
+    global _cache
+    backend = backend or config.result_cache_backend
+    if backend == "memory":
+        _cache = ResultCache(MemoryResultBackend(config.result_cache_max_entries))
+    elif backend == "sqlite":
+        _cache = ResultCache(SQLiteResultBackend(config.result_cache_path))
+    elif backend == "none":
+        _cache = None
+    else:
+        raise ValueError(f"Unknown result cache backend '{backend}'.")
+    return _cache
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Returns the result cache, or None when caching is disabled.
+    """
+    return _cache
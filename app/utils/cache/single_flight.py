@@ -0,0 +1,34 @@
+import asyncio
+
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight task.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Runs fn unless a call for key is already in flight, in which case its result is shared.
+        Returns the result and whether it was shared from another caller's call.
+
+        Callers are shielded from each other: one caller being cancelled does not cancel the
+        shared work for the rest.
+        """
+        future = self._inflight.get(key)
+        shared = future is not None
+        if not shared:
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        return await asyncio.shield(future), shared
+
+    def in_flight(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+
+from typing import Optional
+from collections import OrderedDict
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """
+    Caches Fireflies transcript payloads by transcript ID.
+
+    Entries live in an in-memory LRU bounded by their serialized size and, when a
+    directory is configured, in an on-disk tier that survives restarts.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: Optional[float] = None,
+        disk_dir: Optional[str] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds or None
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _is_expired(self, stored_at: float) -> bool:
+        return (
+            self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
+        )
+
+    def _disk_path(self, transcript_id: str) -> str:
+        digest = hashlib.sha256(transcript_id.encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def _remember(self, transcript_id: str, data: dict, size: int, stored_at: float):
+        self._forget(transcript_id)
+        if size > self.max_bytes:
+            return
+        self._entries[transcript_id] = (stored_at, size, data)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _forget(self, transcript_id: str):
+        entry = self._entries.pop(transcript_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _read_disk(self, transcript_id: str) -> Optional[tuple]:
+        path = self._disk_path(transcript_id)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Could not read cached transcript %s: %s", transcript_id, e)
+            return None
+
+        try:
+            record = json.loads(raw)
+            stored_at, data = record["stored_at"], record["data"]
+        except (ValueError, KeyError, TypeError):
+            # A truncated or corrupted file is dropped and treated as a miss.
+            self._remove_disk(transcript_id)
+            return None
+        if self._is_expired(stored_at):
+            self._remove_disk(transcript_id)
+            return None
+        return stored_at, len(raw), data
+
+    def _write_disk(self, transcript_id: str, raw: str, stored_at: float):
+        """
+        Writes through a temporary file unique to this write, so concurrent writers of the same
+        transcript never interleave. A failed write is logged and only costs the disk copy.
+        """
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(f'{{"stored_at": {json.dumps(stored_at)}, "data": {raw}}}')
+            os.replace(tmp_path, self._disk_path(transcript_id))
+        except OSError as e:
+            logger.warning(
+                "Could not cache transcript %s on disk: %s", transcript_id, e
+            )
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def _serialize(self, transcript_id: str, data: dict, stored_at: float) -> int:
+        """
+        Serializes an entry once, writing it to the disk tier if enabled. Returns its size.
+        """
+        raw = json.dumps(data)
+        if self.disk_dir:
+            self._write_disk(transcript_id, raw, stored_at)
+        return len(raw)
+
+    def _remove_disk(self, transcript_id: str):
+        try:
+            os.remove(self._disk_path(transcript_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(
+                "Could not remove cached transcript %s: %s", transcript_id, e
+            )
+
+    async def get(self, transcript_id: str) -> Optional[dict]:
+        entry = self._entries.get(transcript_id)
+        if entry is not None:
+            if not self._is_expired(entry[0]):
+                self._entries.move_to_end(transcript_id)
+                self.memory_hits += 1
+                return entry[2]
+            self._forget(transcript_id)
+
+        if self.disk_dir:
+            record = await asyncio.to_thread(self._read_disk, transcript_id)
+            if record is not None:
+                stored_at, size, data = record
+                self._remember(transcript_id, data, size, stored_at)
+                self.disk_hits += 1
+                return data
+
+        self.misses += 1
+        return None
+
+    async def set(self, transcript_id: str, data: dict):
+        stored_at = time.time()
+        # Large transcripts take a while to serialize, so keep it off the event loop.
+        size = await asyncio.to_thread(self._serialize, transcript_id, data, stored_at)
+        self._remember(transcript_id, data, size, stored_at)
+
+    async def invalidate(self, transcript_id: str):
+        self._forget(transcript_id)
+        if self.disk_dir:
+            await asyncio.to_thread(self._remove_disk, transcript_id)
+
+    def stats(self) -> dict:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_cache: Optional[TranscriptCache] = None
+
+
+def init_transcript_cache(**kwargs) -> TranscriptCache:
+    global _cache
+    _cache = TranscriptCache(
+        max_bytes=kwargs.pop("max_bytes", config.transcript_cache_max_bytes),
+        ttl_seconds=kwargs.pop("ttl_seconds", config.transcript_cache_ttl_seconds),
+        disk_dir=kwargs.pop("disk_dir", config.transcript_cache_dir),
+    )
+    return _cache
+
+
+def get_transcript_cache() -> TranscriptCache:
+    if _cache is None:
+        raise RuntimeError("Transcript cache is not initialized.")
+    return _cache
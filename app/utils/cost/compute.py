@@ -1,56 +1,140 @@
 import os
+import queue
+import atexit
 import logging
+import threading
 
-from datetime import datetime
+from typing import Optional
 from app.config import config
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 
-# Setup logging configuration
-log_directory = "/logs"
-os.makedirs(log_directory, exist_ok=True)
-
-# Define the log filename based on the current date
-cost_log_filename = os.path.join(log_directory, f"cost_log_{datetime.now().date()}.log")
-
-# Configure logger for chat completion costs
+# Logger for chat completion costs. Records are handed to a queue on the request path and
+# written by a background listener thread, which is attached on first use (or at startup).
 cost_logger = logging.getLogger("cost_logger")
 cost_logger.setLevel(logging.INFO)
-cost_handler = logging.FileHandler(cost_log_filename)
-cost_handler.setFormatter(
-    logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-)
-cost_logger.addHandler(cost_handler)
-
-
-def calculate_chat_completion_cost(completion_usage, model_name=config.gpt_model):
-    models = {
-        "gpt-4o-mini": {
-            "input_price_per_1000_tokens": 0.000150,
-            "output_price_per_1000_tokens": 0.000600,
-            "cached_input_price_per_1M_tokens": 0.075,
-        }
-        # Add more models here if needed
-    }
+cost_logger.propagate = False
+
+_cost_listener: Optional[QueueListener] = None
+_cost_logger_lock = threading.Lock()
+
+
+def init_cost_logger() -> logging.Logger:
+    """
+    Attaches the cost log file, cost_log.log under COST_LOG_DIR, which rolls over at midnight and
+    keeps rotated files with a date suffix. Falls back to stderr when the directory cannot be
+    created or written, e.g. on a read-only filesystem. Calling it again is a no-op.
+    """
+    global _cost_listener
+    with _cost_logger_lock:
+        if _cost_listener is not None:
+            return cost_logger
+
+        try:
+            os.makedirs(config.cost_log_dir, exist_ok=True)
+            handler = TimedRotatingFileHandler(
+                os.path.join(config.cost_log_dir, "cost_log.log"),
+                when="midnight",
+                backupCount=30,
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logging.getLogger(__name__).warning(
+                "Cost log directory %s is not writable (%s); logging costs to stderr.",
+                config.cost_log_dir,
+                e,
+            )
+            handler = logging.StreamHandler()
+        handler.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        )
+
+        cost_log_queue = queue.SimpleQueue()
+        _cost_listener = QueueListener(cost_log_queue, handler)
+        _cost_listener.start()
+        cost_logger.addHandler(QueueHandler(cost_log_queue))
+    return cost_logger
+
+
+def get_cost_logger() -> logging.Logger:
+    if _cost_listener is None:
+        init_cost_logger()
+    return cost_logger
+
+
+@atexit.register
+def close_cost_logger():
+    """
+    Flushes pending cost records and detaches the log file.
+    """
+    global _cost_listener
+    with _cost_logger_lock:
+        if _cost_listener is None:
+            return
+        _cost_listener.stop()
+        for handler in _cost_listener.handlers:
+            handler.close()
+        for handler in list(cost_logger.handlers):
+            cost_logger.removeHandler(handler)
+        _cost_listener = None
 
-    # Find the selected model pricing info
-    selected_model = models.get(model_name)
 
-    if not selected_model:
+def get_cached_tokens(completion_usage) -> int:
+    """
+    Returns the cached prompt token count, whether the details arrive as a dict, an object or not at all.
+    """
+    details = completion_usage.prompt_tokens_details
+    if details is None:
+        return 0
+    if isinstance(details, dict):
+        return details.get("cached_tokens") or 0
+    return getattr(details, "cached_tokens", None) or 0
+
+
+def get_model_pricing(model_name: str) -> dict:
+    """
+    Returns the per-million-token prices for a model from the config. A dated snapshot such as
+    gpt-4o-mini-2024-07-18 falls back to the longest configured name it starts with.
+    """
+    pricing = config.model_pricing
+    if model_name in pricing:
+        return pricing[model_name]
+    prefixes = [name for name in pricing if model_name.startswith(name)]
+    if not prefixes:
         raise ValueError(f"Model '{model_name}' not found.")
+    return pricing[max(prefixes, key=len)]
+
+
+def estimate_completion_cost(
+    model_name: str, prompt_tokens: int, completion_tokens: int
+) -> float:
+    """
+    Estimates the cost of a completion before it is sent, pricing every prompt token as uncached.
+    """
+    selected_model = get_model_pricing(model_name)
+    return (
+        prompt_tokens * selected_model["input"]
+        + completion_tokens * selected_model["output"]
+    ) / 1_000_000
+
+
+def calculate_chat_completion_cost(completion_usage, model_name=None):
+    model_name = model_name or config.gpt_model
+
+    # Find the selected model pricing info
+    selected_model = get_model_pricing(model_name)
 
     # Extract token details from the completion_usage
     completion_tokens = completion_usage.completion_tokens
     prompt_tokens = completion_usage.prompt_tokens
-    cached_tokens = completion_usage.prompt_tokens_details["cached_tokens"]
+    cached_tokens = get_cached_tokens(completion_usage)
 
     # Calculate non-cached input tokens
     non_cached_tokens = prompt_tokens - cached_tokens
 
     # Pricing per token
-    input_price_per_token = selected_model["input_price_per_1000_tokens"] / 1000
-    output_price_per_token = selected_model["output_price_per_1000_tokens"] / 1000
-    cached_input_price_per_token = (
-        selected_model["cached_input_price_per_1M_tokens"] / 1_000_000
-    )
+    input_price_per_token = selected_model["input"] / 1_000_000
+    output_price_per_token = selected_model["output"] / 1_000_000
+    cached_input_price_per_token = selected_model["cached_input"] / 1_000_000
 
     # Cost calculations
     non_cached_input_cost = non_cached_tokens * input_price_per_token
@@ -61,11 +145,11 @@ def calculate_chat_completion_cost(completion_usage, model_name=config.gpt_model
     total_cost = non_cached_input_cost + cached_input_cost + completion_cost
 
     # Log the relevant information
-    cost_logger.info(
+    get_cost_logger().info(
         f"Model: {model_name}, "
-        f"Input Price: ${selected_model['input_price_per_1000_tokens']}, "
-        f"Output Price: ${selected_model['output_price_per_1000_tokens']}, "
-        f"Cached Input Price: ${selected_model['cached_input_price_per_1M_tokens']}, "
+        f"Input Price: ${selected_model['input']}/1M, "
+        f"Output Price: ${selected_model['output']}/1M, "
+        f"Cached Input Price: ${selected_model['cached_input']}/1M, "
         f"Tokens - Input: {prompt_tokens}, Cached: {cached_tokens}, "
         f"Completion: {completion_tokens}, "
         f"Costs - Non-Cached Input: ${non_cached_input_cost:.6f}, "
@@ -75,3 +159,14 @@ def calculate_chat_completion_cost(completion_usage, model_name=config.gpt_model
     )
 
     return total_cost
+
+
+def log_cached_completion_cost(model_name=None):
+    """
+    Records a completion served from the result cache, which costs nothing.
+    """
+    model_name = model_name or config.gpt_model
+    get_cost_logger().info(
+        f"Model: {model_name}, Result cache hit, Total Cost: $0.000000"
+    )
+    return 0.0
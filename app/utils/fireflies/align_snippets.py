@@ -0,0 +1,145 @@
+import re
+
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from app.utils.fireflies.extract_candidate_information import (
+    CandidateInfo,
+    FieldWithSnippet,
+)
+
+# Sentence fields an AlignmentIndex reads.
+ALIGNMENT_FIELDS = ("index", "text", "start_time", "end_time")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# A snippet counts as verified when this share of its n-grams is found in one place in the transcript.
+VERIFIED_COVERAGE = 0.6
+
+# N-grams occurring more often than this carry little signal and are skipped during lookup.
+MAX_POSITIONS_PER_NGRAM = 64
+
+
+def normalize_tokens(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+class AlignmentIndex:
+    """
+    N-gram offset index over a transcript's normalized sentence text, used to resolve free-text
+    snippets back to the sentence range and timestamps they were taken from.
+    """
+
+    def __init__(self, sentences: List[dict], n: int = 3):
+        self.sentences = sentences
+        self.n = n
+        self._tokens: List[str] = []
+        # Token offset at which each sentence starts, for mapping offsets back to sentences.
+        self._sentence_starts: List[int] = []
+        self._ngrams: Dict[tuple, List[int]] = {}
+
+        for sentence in sentences:
+            self._sentence_starts.append(len(self._tokens))
+            self._tokens.extend(normalize_tokens(sentence.get("text")))
+
+        for size in {1, n}:
+            grams = zip(*(self._tokens[shift:] for shift in range(size)))
+            for offset, gram in enumerate(grams):
+                self._ngrams.setdefault(gram, []).append(offset)
+
+    def _sentence_at(self, token_offset: int) -> dict:
+        return self.sentences[bisect_right(self._sentence_starts, token_offset) - 1]
+
+    def align(self, snippet: Optional[str]) -> Optional[dict]:
+        """
+        Finds the densest region of the transcript matching the snippet's n-grams.
+        Returns None for empty snippets.
+        """
+        tokens = normalize_tokens(snippet)
+        if not tokens:
+            return None
+
+        size = self.n if len(tokens) >= self.n else 1
+        grams = [tuple(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+        informative = [
+            gram_index
+            for gram_index, gram in enumerate(grams)
+            if len(self._ngrams.get(gram, ())) <= MAX_POSITIONS_PER_NGRAM
+        ] or range(len(grams))
+        hits = sorted(
+            (position, gram_index)
+            for gram_index in informative
+            for position in self._ngrams.get(grams[gram_index], ())
+        )
+
+        if not hits:
+            return {"verified": False, "coverage": 0.0}
+
+        # Slide a window a little wider than the snippet over the hits and keep the one
+        # covering the most distinct snippet n-grams.
+        width = len(tokens) * 2 + 5
+        counts: Dict[int, int] = {}
+        best = (0, 0, 0)
+        left = 0
+        for right, (position, gram_index) in enumerate(hits):
+            counts[gram_index] = counts.get(gram_index, 0) + 1
+            while position - hits[left][0] > width:
+                left_gram = hits[left][1]
+                counts[left_gram] -= 1
+                if not counts[left_gram]:
+                    del counts[left_gram]
+                left += 1
+            if len(counts) > best[0]:
+                best = (len(counts), left, right)
+
+        distinct, left, right = best
+        coverage = distinct / len(informative)
+        first = self._sentence_at(hits[left][0])
+        last = self._sentence_at(hits[right][0] + size - 1)
+        return {
+            "verified": coverage >= VERIFIED_COVERAGE,
+            "coverage": round(coverage, 3),
+            "start_index": first.get("index"),
+            "end_index": last.get("index"),
+            "start_time": first.get("start_time"),
+            "end_time": last.get("end_time"),
+        }
+
+
+_indexes: "OrderedDict[str, AlignmentIndex]" = OrderedDict()
+MAX_CACHED_INDEXES = 32
+
+
+def get_alignment_index(transcript_id: str, transcript_data: dict) -> AlignmentIndex:
+    """
+    Returns the alignment index for a transcript, building it on first use.
+    """
+    index = _indexes.get(transcript_id)
+    if index is None:
+        sentences = transcript_data["data"]["transcript"]["sentences"]
+        index = AlignmentIndex(sentences)
+        _indexes[transcript_id] = index
+        if len(_indexes) > MAX_CACHED_INDEXES:
+            _indexes.popitem(last=False)
+    else:
+        _indexes.move_to_end(transcript_id)
+    return index
+
+
+def align_candidate_snippets(
+    info: CandidateInfo, index: AlignmentIndex, fields: Optional[List[str]] = None
+) -> Dict[str, Optional[dict]]:
+    """
+    Aligns every snippet in a CandidateInfo, or only those of the given fields.
+    List fields are keyed as "pitched_jobs[0].role".
+    """
+    provenance = {}
+    for name in fields or CandidateInfo.model_fields:
+        value = getattr(info, name)
+        if isinstance(value, FieldWithSnippet):
+            provenance[name] = index.align(value.snippet)
+            continue
+        for position, item in enumerate(value or []):
+            for key, field in item.items():
+                provenance[f"{name}[{position}].{key}"] = index.align(field.snippet)
+    return provenance
@@ -0,0 +1,102 @@
+import time
+import asyncio
+
+from typing import List, Optional
+from app.utils.fireflies.client import FirefliesClient
+from app.utils.cache.transcript_cache import TranscriptCache
+from app.utils.fireflies.fetch_messages import fetch_transcript
+from app.utils.fireflies.parse_transcript import (
+    render_transcript,
+    transcript_render_fields,
+)
+from app.utils.fireflies.align_snippets import (
+    ALIGNMENT_FIELDS,
+    align_candidate_snippets,
+    get_alignment_index,
+)
+from app.utils.fireflies.extraction_store import (
+    store_candidate_information,
+    store_cheat_sheet,
+)
+from app.utils.fireflies.extract_cheat_sheet import extract_cheat_sheet_async
+from app.utils.fireflies.extract_candidate_information import (
+    extract_candidate_information_async,
+    project_candidate_information,
+)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+async def _timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, _elapsed_ms(start)
+
+
+async def analyze_transcript(
+    transcript_id: str,
+    client: FirefliesClient,
+    cache: Optional[TranscriptCache] = None,
+    fields: Optional[List[str]] = None,
+    include_snippets: bool = True,
+):
+    """
+    Fetches and parses a transcript once, then runs both extractions concurrently.
+    Returns the results together with per-stage timings and costs. fields and include_snippets
+    slim the returned candidate information; the full result is still stored.
+    """
+    total_start = time.perf_counter()
+
+    transcript_data, fetch_ms = await _timed(
+        fetch_transcript(
+            transcript_id,
+            client,
+            cache,
+            fields=transcript_render_fields() + ALIGNMENT_FIELDS,
+        )
+    )
+
+    parse_start = time.perf_counter()
+    parsed_transcript = render_transcript(transcript_data)
+    parse_ms = _elapsed_ms(parse_start)
+
+    (candidate, candidate_ms), (cheat_sheet, cheat_sheet_ms) = await asyncio.gather(
+        _timed(extract_candidate_information_async(parsed_transcript)),
+        _timed(extract_cheat_sheet_async(parsed_transcript)),
+    )
+    await store_candidate_information(transcript_id, candidate.parsed)
+    await store_cheat_sheet(transcript_id, cheat_sheet.parsed)
+    alignment_index = get_alignment_index(transcript_id, transcript_data)
+
+    return {
+        "extracted_information": project_candidate_information(
+            candidate.parsed, fields, include_snippets
+        ),
+        "extracted_cheat_sheet": cheat_sheet.parsed,
+        "provenance": align_candidate_snippets(
+            candidate.parsed, alignment_index, fields
+        ),
+        "timings_ms": {
+            "fetch": fetch_ms,
+            "parse": parse_ms,
+            "extract_information": candidate_ms,
+            "extract_cheat_sheet": cheat_sheet_ms,
+            "total": _elapsed_ms(total_start),
+        },
+        "costs": {
+            "extract_information": candidate.cost,
+            "extract_cheat_sheet": cheat_sheet.cost,
+            "total": candidate.cost + cheat_sheet.cost,
+        },
+        "estimated_costs": {
+            "extract_information": candidate.estimated_cost,
+            "extract_cheat_sheet": cheat_sheet.estimated_cost,
+            "total": candidate.estimated_cost + cheat_sheet.estimated_cost,
+        },
+        "models": {
+            "extract_information": candidate.model,
+            "extract_cheat_sheet": cheat_sheet.model,
+        },
+    }
@@ -0,0 +1,93 @@
+import time
+import asyncio
+
+from typing import AsyncIterator, List, Optional
+from fastapi import HTTPException
+from app.utils.fireflies.client import FirefliesClient
+from app.utils.cache.transcript_cache import TranscriptCache
+from app.utils.fireflies.fetch_messages import fetch_transcript
+from app.utils.fireflies.parse_transcript import (
+    render_transcript,
+    transcript_render_fields,
+)
+from app.utils.fireflies.extraction_store import store_candidate_information
+from app.utils.fireflies.extract_candidate_information import (
+    extract_candidate_information_async,
+    project_candidate_information,
+)
+
+
+async def _extract_one(
+    transcript_id: str,
+    client: FirefliesClient,
+    cache: Optional[TranscriptCache],
+    semaphore: asyncio.Semaphore,
+    fields: Optional[List[str]],
+    include_snippets: bool,
+) -> dict:
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            transcript_data = await fetch_transcript(
+                transcript_id, client, cache, fields=transcript_render_fields()
+            )
+            parsed_transcript = render_transcript(transcript_data)
+            result = await extract_candidate_information_async(parsed_transcript)
+            await store_candidate_information(transcript_id, result.parsed)
+        except HTTPException as e:
+            return {
+                "transcriptId": transcript_id,
+                "status": "error",
+                "status_code": e.status_code,
+                "detail": e.detail,
+            }
+        except Exception as e:
+            return {
+                "transcriptId": transcript_id,
+                "status": "error",
+                "status_code": 500,
+                "detail": str(e),
+            }
+
+        return {
+            "transcriptId": transcript_id,
+            "status": "ok",
+            "extracted_information": project_candidate_information(
+                result.parsed, fields, include_snippets
+            ),
+            "model": result.model,
+            "estimated_cost": result.estimated_cost,
+            "cost": result.cost,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+
+async def batch_extract_information(
+    transcript_ids: List[str],
+    client: FirefliesClient,
+    cache: Optional[TranscriptCache],
+    max_concurrency: int,
+    fields: Optional[List[str]] = None,
+    include_snippets: bool = True,
+) -> AsyncIterator[dict]:
+    """
+    Extracts candidate information for many transcripts with bounded concurrency.
+    Yields one result per transcript as soon as it completes; failures are reported
+    per transcript and never abort the batch. fields and include_snippets slim each result.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = [
+        asyncio.create_task(
+            _extract_one(
+                transcript_id, client, cache, semaphore, fields, include_snippets
+            )
+        )
+        for transcript_id in dict.fromkeys(transcript_ids)
+    ]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
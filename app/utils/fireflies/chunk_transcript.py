@@ -0,0 +1,68 @@
+from typing import List, Optional
+from app.utils.llm.tokens import count_tokens
+from app.utils.fireflies.parse_transcript import LEGEND_PREFIX
+
+
+def split_turns(transcript: str) -> List[List[str]]:
+    """
+    Groups the lines of a parsed transcript into speaker turns (consecutive lines by the same speaker).
+    """
+    turns = []
+    current_speaker = None
+
+    for line in transcript.splitlines():
+        speaker = line.split(": ", 1)[0]
+        if turns and speaker == current_speaker:
+            turns[-1].append(line)
+        else:
+            turns.append([line])
+            current_speaker = speaker
+
+    return turns
+
+
+def chunk_transcript(
+    transcript: str, max_tokens: int, model: Optional[str] = None
+) -> List[str]:
+    """
+    Splits a parsed transcript into chunks of at most max_tokens, breaking only between speaker turns.
+    A single turn longer than the budget is split between its lines. The speaker legend of a
+    compact transcript is repeated at the top of every chunk.
+    """
+    header = []
+    if transcript.startswith(LEGEND_PREFIX):
+        legend, _, transcript = transcript.partition("\n")
+        header = [legend]
+        max_tokens = max(max_tokens - count_tokens(legend, model), 1)
+
+    chunks = []
+    current_lines = []
+    current_tokens = 0
+
+    def flush():
+        nonlocal current_lines, current_tokens
+        if current_lines:
+            chunks.append("\n".join(header + current_lines))
+        current_lines = []
+        current_tokens = 0
+
+    for turn in split_turns(transcript):
+        line_tokens = [count_tokens(line, model) + 1 for line in turn]
+        turn_tokens = sum(line_tokens)
+
+        if current_tokens + turn_tokens > max_tokens:
+            flush()
+
+        if turn_tokens <= max_tokens:
+            current_lines.extend(turn)
+            current_tokens += turn_tokens
+            continue
+
+        for line, tokens in zip(turn, line_tokens):
+            if current_tokens + tokens > max_tokens:
+                flush()
+            current_lines.append(line)
+            current_tokens += tokens
+
+    flush()
+    return chunks
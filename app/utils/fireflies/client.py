@@ -0,0 +1,133 @@
+import httpx
+
+from typing import Optional
+from app.config import config
+from fastapi import HTTPException
+from app.utils.upstream import Retry, Upstream, parse_retry_after
+
+
+def classify_fireflies_error(error: BaseException) -> Optional[Retry]:
+    """
+    Retries rate limits, server errors and transport failures; other errors are final.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        if status == 429:
+            return Retry(
+                throttled=True, retry_after=parse_retry_after(error.response.headers)
+            )
+        if status >= 500:
+            return Retry(retry_after=parse_retry_after(error.response.headers))
+        return None
+    if isinstance(error, httpx.TransportError):
+        return Retry()
+    return None
+
+
+class FirefliesClient:
+    """
+    Async GraphQL client for the Fireflies API backed by a pooled keep-alive connection.
+    Requests go through an Upstream that rate-limits, retries and adapts concurrency.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        requests_per_minute: int = 60,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url
+        self.upstream = Upstream(
+            "fireflies",
+            classify_fireflies_error,
+            max_concurrency=max_connections,
+            requests_per_minute=requests_per_minute,
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+            backoff_max=backoff_max,
+        )
+        self._http = httpx.AsyncClient(
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {api_key}",
+            },
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            transport=transport,
+        )
+
+    async def execute(self, query: str, variables: Optional[dict] = None) -> dict:
+        """
+        Sends a GraphQL query and returns the decoded JSON response.
+        """
+        data = {"query": query}
+        if variables is not None:
+            data["variables"] = variables
+
+        async def post():
+            response = await self._http.post(self.url, json=data)
+            response.raise_for_status()
+            return response
+
+        try:
+            response = await self.upstream.call(post)
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(
+                status_code=e.response.status_code, detail=e.response.text
+            ) from e
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=502, detail=str(e)) from e
+        return response.json()
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+_client: Optional[FirefliesClient] = None
+
+
+def init_fireflies_client(**kwargs) -> FirefliesClient:
+    """
+    Creates the process-wide Fireflies client. Called once from the app lifespan.
+    """
+    global _client
+    _client = FirefliesClient(
+        url=kwargs.pop("url", config.fireflies_url),
+        api_key=kwargs.pop("api_key", config.fireflies_api_key),
+        timeout=kwargs.pop("timeout", config.fireflies_timeout),
+        max_connections=kwargs.pop("max_connections", config.fireflies_max_connections),
+        max_keepalive_connections=kwargs.pop(
+            "max_keepalive_connections", config.fireflies_max_keepalive_connections
+        ),
+        requests_per_minute=kwargs.pop(
+            "requests_per_minute", config.fireflies_requests_per_minute
+        ),
+        max_retries=kwargs.pop("max_retries", config.upstream_max_retries),
+        backoff_base=kwargs.pop("backoff_base", config.upstream_backoff_base_seconds),
+        backoff_max=kwargs.pop("backoff_max", config.upstream_backoff_max_seconds),
+        **kwargs,
+    )
+    return _client
+
+
+def get_fireflies_client() -> FirefliesClient:
+    if _client is None:
+        raise RuntimeError("Fireflies client is not initialized.")
+    return _client
+
+
+async def close_fireflies_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,11 +1,17 @@
-from openai import OpenAI
+import json
+import asyncio
+
 from app.config import config
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict
-from app.utils.cost.compute import calculate_chat_completion_cost
-
-# Initialize the OpenAI client
-client = OpenAI(api_key=config.openai_api_key)
+from app.utils.llm.preflight import count_message_tokens, plan_prompt
+from app.utils.fireflies.chunk_transcript import chunk_transcript
+from app.utils.llm.completion import (
+    CompletionResult,
+    combine_results,
+    parse_completion,
+    parsed_parts,
+)
 
 
 class FieldWithSnippet(BaseModel):
@@ -73,24 +79,121 @@ class CandidateInfo(BaseModel):
     )
 
 
-# Function to get structured candidate information from the transcript
-def extract_candidate_information(transcript: str):
-    # Call the OpenAI API with the request to extract structured data
-    completion = client.beta.chat.completions.parse(
-        model=config.gpt_model,
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an assistant that extracts structured information from transcripts.",
-            },
-            {
-                "role": "user",
-                "content": f"Extract the candidate information in JSON format: {transcript}",
-            },
-        ],
-        response_format=CandidateInfo,
-    )
-
-    completion_cost = calculate_chat_completion_cost(completion.usage)
-    print("completion cost:", completion_cost)
-    return completion.choices[0].message.parsed
+def project_candidate_information(
+    info: CandidateInfo,
+    fields: Optional[List[str]] = None,
+    include_snippets: bool = True,
+) -> dict:
+    """
+    Dumps a CandidateInfo keeping only the given fields, or all of them.
+    Without snippets every FieldWithSnippet, including those in list items, collapses to its value.
+    """
+    data = info.model_dump(mode="json", include=set(fields) if fields else None)
+    if include_snippets:
+        return data
+
+    for name, field in data.items():
+        if isinstance(field, list):
+            data[name] = [
+                {key: item_field["value"] for key, item_field in item.items()}
+                for item in field
+            ]
+        elif field is not None:
+            data[name] = field["value"]
+    return data
+
+
+OPERATION = "extract_information"
+
+# Static instructions come first and stay byte-identical across calls so the provider's
+# prompt prefix cache can reuse them; only the transcript varies, and it goes last.
+SYSTEM_PROMPT = (
+    "You are an assistant that extracts structured information from transcripts. "
+    "Extract the candidate information in JSON format from the interview transcript "
+    "provided by the user."
+)
+
+
+def build_messages(transcript: str) -> List[dict]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Transcript:\n{transcript}"},
+    ]
+
+
+def _pick_best_supported(fields: List[FieldWithSnippet]) -> FieldWithSnippet:
+    """
+    Picks the value reported by the most chunks, preferring the longest snippet and then the earliest chunk.
+    """
+    candidates = [field for field in fields if field.value]
+    if not candidates:
+        return fields[0]
+
+    support = {}
+    for field in candidates:
+        key = field.value.strip().casefold()
+        support[key] = support.get(key, 0) + 1
+
+    return max(
+        candidates,
+        key=lambda field: (
+            support[field.value.strip().casefold()],
+            len(field.snippet or ""),
+        ),
+    )
+
+
+def _union(lists: List[Optional[List[Dict[str, FieldWithSnippet]]]]):
+    merged = {}
+    for items in lists:
+        for item in items or []:
+            key = json.dumps(
+                {name: field.model_dump() for name, field in item.items()},
+                sort_keys=True,
+            )
+            merged.setdefault(key, item)
+    return list(merged.values())
+
+
+def merge_candidate_information(
+    parts: List[Optional[CandidateInfo]],
+) -> CandidateInfo:
+    """
+    Deterministically merges the CandidateInfo extracted from each transcript chunk.
+    Chunks the model refused (None) are skipped.
+    """
+    parts = parsed_parts(parts, OPERATION)
+    merged = {}
+    for name, field in CandidateInfo.model_fields.items():
+        values = [getattr(part, name) for part in parts]
+        if field.annotation is FieldWithSnippet:
+            merged[name] = _pick_best_supported(values)
+        else:
+            merged[name] = _union(values)
+    return CandidateInfo(**merged)
+
+
+async def extract_candidate_information_async(
+    transcript: str, chunked: Optional[bool] = None
+) -> CompletionResult:
+    """
+    Extracts candidate information on the shared async OpenAI client.
+    The rendered prompt is counted first and routed by size (see plan_prompt): it goes whole to
+    the fast default model or the long-context model, or is extracted chunk by chunk and merged.
+    """
+    messages = build_messages(transcript)
+    plan = plan_prompt(count_message_tokens(messages), chunked)
+
+    chunks = []
+    if plan.chunked:
+        chunks = chunk_transcript(transcript, config.chunk_max_tokens)
+    if len(chunks) <= 1:
+        return await parse_completion(
+            messages, CandidateInfo, model=plan.model, prompt_tokens=plan.prompt_tokens
+        )
+
+    results = await asyncio.gather(
+        *(parse_completion(build_messages(chunk), CandidateInfo) for chunk in chunks)
+    )
+    merged = merge_candidate_information([result.parsed for result in results])
+    return combine_results(results, merged)
@@ -1,11 +1,17 @@
+import asyncio
+
 from enum import Enum
-from openai import OpenAI
 from app.config import config
 from pydantic import BaseModel, Field
 from typing import List, Optional, Union
-from app.utils.cost.compute import calculate_chat_completion_cost
-
-client = OpenAI(api_key=config.openai_api_key)
+from app.utils.llm.preflight import count_message_tokens, plan_prompt
+from app.utils.fireflies.chunk_transcript import chunk_transcript
+from app.utils.llm.completion import (
+    CompletionResult,
+    combine_results,
+    parse_completion,
+    parsed_parts,
+)
 
 
 class MainCategory(str, Enum):
@@ -107,40 +113,111 @@ generic_questions = {
 }
 
 
-def extract_cheat_sheet(transcript: str) -> CheatSheet:
-    prompt = f"""
-    Given the following transcript of an interview, evaluate each question in the categories below:
-    - Determine if the question was answered in the transcript.
-    - If answered, provide a brief summary of the answer.
-    - If not answered, set the summary to null.
+def _render_questions(questions: dict) -> str:
+    return "\n".join(
+        f"  {subcategory.value}:\n"
+        + "\n".join(f"    - {question}" for question in subcategory_questions)
+        for subcategory, subcategory_questions in questions.items()
+    )
 
-    Transcript:
-    {transcript}
 
-    Questions to evaluate:
+OPERATION = "extract_cheat_sheet"
 
-    Industry-Specific Questions:
-    {industry_specific_questions}
+# Static instructions and question sets come first and stay byte-identical across calls so the
+# provider's prompt prefix cache can reuse them; only the transcript varies, and it goes last.
+SYSTEM_PROMPT = f"""You are an assistant that extracts structured information from transcripts.
 
-    Generic Questions:
-    {generic_questions}
+Given the transcript of an interview provided by the user, evaluate each question in the categories below:
+- Determine if the question was answered in the transcript.
+- If answered, provide a brief summary of the answer.
+- If not answered, set the summary to null.
+
+Questions to evaluate:
+
+{MainCategory.INDUSTRY_SPECIFIC.value}:
+{_render_questions(industry_specific_questions)}
+
+{MainCategory.GENERIC.value}:
+{_render_questions(generic_questions)}
+
+Extract the information in JSON format matching the CheatSheet model structure.
+Ensure that all category and subcategory names exactly match the enum values defined in the model."""
 
-    Extract the information in JSON format matching the CheatSheet model structure.
-    Ensure that all category and subcategory names exactly match the enum values defined in the model.
-    """
 
-    completion = client.beta.chat.completions.parse(
-        model=config.gpt_model,
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an assistant that extracts structured information from transcripts.",
-            },
-            {"role": "user", "content": prompt},
-        ],
-        response_format=CheatSheet,
+def build_messages(transcript: str) -> List[dict]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Transcript:\n{transcript}"},
+    ]
+
+
+def merge_cheat_sheets(parts: List[Optional[CheatSheet]]) -> CheatSheet:
+    """
+    Deterministically merges the CheatSheets extracted from each transcript chunk.
+    A question counts as answered if any chunk answered it; distinct summaries are joined in chunk order.
+    Chunks the model refused (None) are skipped.
+    """
+    parts = parsed_parts(parts, OPERATION)
+    merged = {}
+    for part in parts:
+        for evaluation in part.evaluations:
+            subcategories = merged.setdefault(evaluation.main_category, {})
+            for subcategory in evaluation.subcategories:
+                questions = subcategories.setdefault(subcategory.category_name, {})
+                for question in subcategory.questions:
+                    entry = questions.setdefault(
+                        question.question, {"is_answered": False, "summaries": []}
+                    )
+                    entry["is_answered"] = entry["is_answered"] or question.is_answered
+                    summary = question.answer_summary
+                    if summary and summary not in entry["summaries"]:
+                        entry["summaries"].append(summary)
+
+    return CheatSheet(
+        evaluations=[
+            MainCategoryEvaluation(
+                main_category=main_category,
+                subcategories=[
+                    CategoryEvaluation(
+                        category_name=category_name,
+                        questions=[
+                            QuestionWithAnswer(
+                                question=question,
+                                is_answered=entry["is_answered"],
+                                answer_summary=" ".join(entry["summaries"]) or None,
+                            )
+                            for question, entry in questions.items()
+                        ],
+                    )
+                    for category_name, questions in subcategories.items()
+                ],
+            )
+            for main_category, subcategories in merged.items()
+        ]
     )
 
-    completion_cost = calculate_chat_completion_cost(completion.usage)
-    print("completion cost:", completion_cost)
-    return completion.choices[0].message.parsed
+
+async def extract_cheat_sheet_async(
+    transcript: str, chunked: Optional[bool] = None
+) -> CompletionResult:
+    """
+    Evaluates the cheat sheet questions on the shared async OpenAI client.
+    The rendered prompt is counted first and routed by size (see plan_prompt): it goes whole to
+    the fast default model or the long-context model, or is evaluated chunk by chunk and merged.
+    """
+    messages = build_messages(transcript)
+    plan = plan_prompt(count_message_tokens(messages), chunked)
+
+    chunks = []
+    if plan.chunked:
+        chunks = chunk_transcript(transcript, config.chunk_max_tokens)
+    if len(chunks) <= 1:
+        return await parse_completion(
+            messages, CheatSheet, model=plan.model, prompt_tokens=plan.prompt_tokens
+        )
+
+    results = await asyncio.gather(
+        *(parse_completion(build_messages(chunk), CheatSheet) for chunk in chunks)
+    )
+    merged = merge_cheat_sheets([result.parsed for result in results])
+    return combine_results(results, merged)
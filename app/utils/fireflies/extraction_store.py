@@ -0,0 +1,368 @@
+import re
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+
+from typing import List, Optional, Tuple
+from app.config import config
+from app.utils.fireflies.extract_cheat_sheet import CheatSheet
+from app.utils.fireflies.extract_candidate_information import CandidateInfo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    transcript_id TEXT PRIMARY KEY,
+    name TEXT COLLATE NOCASE,
+    position TEXT COLLATE NOCASE,
+    desired_position TEXT COLLATE NOCASE,
+    desired_location TEXT COLLATE NOCASE,
+    desired_salary TEXT COLLATE NOCASE,
+    notice_period TEXT,
+    notice_period_days REAL,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_notice_period_days ON candidates (notice_period_days);
+CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5 (
+    name, desired_position, desired_location, desired_salary
+);
+CREATE TABLE IF NOT EXISTS cheat_sheets (
+    transcript_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cheat_sheet_questions (
+    transcript_id TEXT NOT NULL,
+    main_category TEXT NOT NULL,
+    subcategory TEXT NOT NULL,
+    question TEXT NOT NULL,
+    is_answered INTEGER NOT NULL,
+    answer_summary TEXT
+);
+CREATE INDEX IF NOT EXISTS cheat_sheet_questions_transcript ON cheat_sheet_questions (transcript_id);
+CREATE INDEX IF NOT EXISTS cheat_sheet_questions_status
+    ON cheat_sheet_questions (subcategory, is_answered, transcript_id);
+CREATE INDEX IF NOT EXISTS cheat_sheet_questions_answered
+    ON cheat_sheet_questions (is_answered, transcript_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS cheat_sheet_questions_fts USING fts5 (question);
+"""
+
+# Full-text rows share the rowid of the row they index; rows saved before the full-text
+# tables existed are indexed on startup.
+BACKFILL = """
+INSERT INTO candidates_fts (rowid, name, desired_position, desired_location, desired_salary)
+    SELECT rowid, name, desired_position, desired_location, desired_salary FROM candidates
+    WHERE rowid NOT IN (SELECT rowid FROM candidates_fts);
+INSERT INTO cheat_sheet_questions_fts (rowid, question)
+    SELECT rowid, question FROM cheat_sheet_questions
+    WHERE rowid NOT IN (SELECT rowid FROM cheat_sheet_questions_fts);
+"""
+
+NUMBER_WORDS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+    "eleven": 11,
+    "twelve": 12,
+}
+
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+NOTICE_PATTERN = re.compile(
+    r"\b(\d+(?:\.\d+)?|"
+    + "|".join(NUMBER_WORDS)
+    + r")\s*-?\s*(day|week|month|year)s?\b",
+    re.IGNORECASE,
+)
+
+
+def parse_notice_period_days(notice_period: Optional[str]) -> Optional[float]:
+    """
+    Converts a free-text notice period such as "2 weeks" or "one month" into days.
+    Returns None when the text cannot be interpreted.
+    """
+    if not notice_period:
+        return None
+    if re.search(
+        r"\b(immediate(ly)?|asap|none|no notice)\b", notice_period, re.IGNORECASE
+    ):
+        return 0.0
+
+    match = NOTICE_PATTERN.search(notice_period)
+    if match is None:
+        return None
+    amount, unit = match.groups()
+    amount = NUMBER_WORDS.get(amount.lower()) or float(amount)
+    return float(amount) * UNIT_DAYS[unit.lower()]
+
+
+def match_prefix(value: str) -> str:
+    """
+    Builds an FTS5 query matching text that contains every word of value, the last one as a prefix.
+    Returns an empty string when value has no searchable words.
+    """
+    words = re.findall(r"\w+", value)
+    return " ".join(
+        f'"{word}"*' if position == len(words) - 1 else f'"{word}"'
+        for position, word in enumerate(words)
+    )
+
+
+class ExtractionStore:
+    """
+    Persists every extraction in SQLite with indexed columns for the key candidate fields
+    and the per-question cheat-sheet status, so queries never reach an upstream.
+    All methods are blocking and meant to be called through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        self._conn.executescript(BACKFILL)
+        self._conn.commit()
+
+    def save_candidate(self, transcript_id: str, info: CandidateInfo):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM candidates_fts WHERE rowid = "
+                "(SELECT rowid FROM candidates WHERE transcript_id = ?)",
+                (transcript_id,),
+            )
+            cursor = self._conn.execute(
+                "INSERT OR REPLACE INTO candidates (transcript_id, name, position, "
+                "desired_position, desired_location, desired_salary, notice_period, "
+                "notice_period_days, payload, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    transcript_id,
+                    info.name.value,
+                    info.position.value,
+                    info.desired_position.value,
+                    info.desired_location.value,
+                    info.desired_salary.value,
+                    info.notice_period.value,
+                    parse_notice_period_days(info.notice_period.value),
+                    info.model_dump_json(),
+                    time.time(),
+                ),
+            )
+            self._conn.execute(
+                "INSERT INTO candidates_fts (rowid, name, desired_position, "
+                "desired_location, desired_salary) VALUES (?, ?, ?, ?, ?)",
+                (
+                    cursor.lastrowid,
+                    info.name.value,
+                    info.desired_position.value,
+                    info.desired_location.value,
+                    info.desired_salary.value,
+                ),
+            )
+            self._conn.commit()
+
+    def save_cheat_sheet(self, transcript_id: str, cheat_sheet: CheatSheet):
+        rows = [
+            (
+                transcript_id,
+                evaluation.main_category.value,
+                subcategory.category_name.value,
+                question.question,
+                int(question.is_answered),
+                question.answer_summary,
+            )
+            for evaluation in cheat_sheet.evaluations
+            for subcategory in evaluation.subcategories
+            for question in subcategory.questions
+        ]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cheat_sheets (transcript_id, payload, updated_at) "
+                "VALUES (?, ?, ?)",
+                (transcript_id, cheat_sheet.model_dump_json(), time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM cheat_sheet_questions_fts WHERE rowid IN "
+                "(SELECT rowid FROM cheat_sheet_questions WHERE transcript_id = ?)",
+                (transcript_id,),
+            )
+            self._conn.execute(
+                "DELETE FROM cheat_sheet_questions WHERE transcript_id = ?",
+                (transcript_id,),
+            )
+            self._conn.executemany(
+                "INSERT INTO cheat_sheet_questions (transcript_id, main_category, "
+                "subcategory, question, is_answered, answer_summary) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT INTO cheat_sheet_questions_fts (rowid, question) "
+                "SELECT rowid, question FROM cheat_sheet_questions WHERE transcript_id = ?",
+                (transcript_id,),
+            )
+            self._conn.commit()
+
+    def search_candidates(
+        self,
+        limit: int,
+        skip: int,
+        name: Optional[str] = None,
+        desired_position: Optional[str] = None,
+        desired_location: Optional[str] = None,
+        desired_salary: Optional[str] = None,
+        min_notice_days: Optional[float] = None,
+        max_notice_days: Optional[float] = None,
+    ) -> Tuple[List[dict], int]:
+        """
+        Filters candidates by notice period range and by the words of the text fields through the
+        full-text index: a filter matches text containing all of its words, case-insensitively,
+        with the last word as a prefix, so "dub" and "dubai" both match "Abu Dhabi or Dubai".
+        """
+        clauses = []
+        params = []
+        matches = {
+            column: match_prefix(value)
+            for column, value in (
+                ("name", name),
+                ("desired_position", desired_position),
+                ("desired_location", desired_location),
+                ("desired_salary", desired_salary),
+            )
+            if value
+        }
+        if matches:
+            if not all(matches.values()):
+                return [], 0
+            clauses.append(
+                "rowid IN (SELECT rowid FROM candidates_fts WHERE candidates_fts MATCH ?)"
+            )
+            params.append(
+                " AND ".join(
+                    f"{column} : ({query})" for column, query in matches.items()
+                )
+            )
+        if min_notice_days is not None:
+            clauses.append("notice_period_days >= ?")
+            params.append(min_notice_days)
+        if max_notice_days is not None:
+            clauses.append("notice_period_days <= ?")
+            params.append(max_notice_days)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM candidates {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT transcript_id, name, position, desired_position, desired_location, "
+                f"desired_salary, notice_period, notice_period_days, updated_at FROM candidates {where} "
+                "ORDER BY updated_at DESC, transcript_id LIMIT ? OFFSET ?",
+                [*params, limit, skip],
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def search_questions(
+        self,
+        limit: int,
+        skip: int,
+        subcategory: Optional[str] = None,
+        question: Optional[str] = None,
+        is_answered: Optional[bool] = None,
+        transcript_id: Optional[str] = None,
+    ) -> Tuple[List[dict], int]:
+        clauses = []
+        params = []
+        if subcategory:
+            clauses.append("subcategory = ?")
+            params.append(subcategory)
+        if question:
+            if not match_prefix(question):
+                return [], 0
+            clauses.append(
+                "rowid IN (SELECT rowid FROM cheat_sheet_questions_fts "
+                "WHERE cheat_sheet_questions_fts MATCH ?)"
+            )
+            params.append(match_prefix(question))
+        if is_answered is not None:
+            clauses.append("is_answered = ?")
+            params.append(int(is_answered))
+        if transcript_id:
+            clauses.append("transcript_id = ?")
+            params.append(transcript_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM cheat_sheet_questions {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT transcript_id, main_category, subcategory, question, is_answered, "
+                f"answer_summary FROM cheat_sheet_questions {where} "
+                "ORDER BY transcript_id, rowid LIMIT ? OFFSET ?",
+                [*params, limit, skip],
+            ).fetchall()
+        return [
+            {**dict(row), "is_answered": bool(row["is_answered"])} for row in rows
+        ], total
+
+    def get(self, transcript_id: str) -> Optional[dict]:
+        with self._lock:
+            candidate = self._conn.execute(
+                "SELECT payload FROM candidates WHERE transcript_id = ?",
+                (transcript_id,),
+            ).fetchone()
+            cheat_sheet = self._conn.execute(
+                "SELECT payload FROM cheat_sheets WHERE transcript_id = ?",
+                (transcript_id,),
+            ).fetchone()
+        if candidate is None and cheat_sheet is None:
+            return None
+        return {
+            "transcriptId": transcript_id,
+            "extracted_information": json.loads(candidate[0]) if candidate else None,
+            "extracted_cheat_sheet": (
+                json.loads(cheat_sheet[0]) if cheat_sheet else None
+            ),
+        }
+
+
+_store: Optional[ExtractionStore] = None
+
+
+def init_extraction_store() -> ExtractionStore:
+    global _store
+    _store = ExtractionStore(config.extraction_store_path)
+    return _store
+
+
+def get_extraction_store() -> ExtractionStore:
+    if _store is None:
+        raise RuntimeError("Extraction store is not initialized.")
+    return _store
+
+
+async def store_candidate_information(transcript_id: str, info: CandidateInfo):
+    """
+    Persists a CandidateInfo extraction; a no-op when the store is not initialized.
+    """
+    if _store is not None and info is not None:
+        await asyncio.to_thread(_store.save_candidate, transcript_id, info)
+
+
+async def store_cheat_sheet(transcript_id: str, cheat_sheet: CheatSheet):
+    """
+    Persists a CheatSheet extraction; a no-op when the store is not initialized.
+    """
+    if _store is not None and cheat_sheet is not None:
+        await asyncio.to_thread(_store.save_cheat_sheet, transcript_id, cheat_sheet)
@@ -1,40 +1,133 @@
-import requests
-
+from functools import lru_cache
 from fastapi import HTTPException
+from typing import Iterable, Optional, Tuple
+from app.utils.fireflies.client import FirefliesClient
+from app.utils.metrics.telemetry import track_stage
+from app.utils.cache.single_flight import SingleFlight
+from app.utils.cache.transcript_cache import TranscriptCache
+
+# Every sentence field the service knows about, in the order they are requested.
+SENTENCE_FIELDS = (
+    "index",
+    "speaker_name",
+    "speaker_id",
+    "text",
+    "raw_text",
+    "start_time",
+    "end_time",
+)
+
+
+def normalize_fields(fields: Iterable[str]) -> Tuple[str, ...]:
+    requested = set(fields)
+    return tuple(field for field in SENTENCE_FIELDS if field in requested)
+
+
+@lru_cache(maxsize=None)
+def transcript_query(fields: Tuple[str, ...] = SENTENCE_FIELDS) -> str:
+    """
+    Builds the transcript query selecting only the given sentence fields.
+    """
+    selection = "\n".join(f"            {field}" for field in fields)
+    return f"""
+query Transcript($transcriptId: String!) {{
+    transcript(id: $transcriptId) {{
+        sentences {{
+{selection}
+        }}
+    }}
+}}"""
+
+
+# Concurrent fetches of the same transcript share one Fireflies request.
+transcript_flight = SingleFlight()
+
+TRANSCRIPTS_QUERY = (
+    "query Transcripts($userId: String) { transcripts(user_id: $userId) { title id } }"
+)
+
+
+async def fetch_transcripts(user_id: str, client: FirefliesClient):
+    """
+    Fetches the list of transcripts (title and ID) belonging to the given user.
+    """
+    return await client.execute(TRANSCRIPTS_QUERY, {"userId": user_id})
 
 
-def fetch_transcript(transcript_id: str, url: str, firefly_api_key: str):
-    """
-    Fetches the transcript data from the API using the given transcript ID.
-    """
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {firefly_api_key}",
-    }
-
-    data = {
-        "query": """
-        query Transcript($transcriptId: String!) { 
-            transcript(id: $transcriptId) {
-                sentences {
-                    index
-                    speaker_name
-                    speaker_id
-                    text
-                    raw_text
-                    start_time
-                    end_time
-                }
-            }
-        }""",
-        "variables": {"transcriptId": transcript_id},
-    }
-
-    try:
-        response = requests.post(url, json=data, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
-        raise HTTPException(
-            status_code=response.status_code if response else 500, detail=str(e)
+def _sentences(transcript_data: dict) -> list:
+    return ((transcript_data.get("data") or {}).get("transcript") or {}).get(
+        "sentences"
+    ) or []
+
+
+def _fetched_fields(transcript_data: dict) -> Tuple[str, ...]:
+    sentences = _sentences(transcript_data)
+    if not sentences:
+        return SENTENCE_FIELDS
+    return normalize_fields(sentences[0])
+
+
+def project_transcript(transcript_data: dict, fields: Iterable[str]) -> dict:
+    """
+    Returns a copy of transcript data keeping only the given sentence fields.
+    """
+    fields = normalize_fields(fields)
+    if _fetched_fields(transcript_data) == fields:
+        return transcript_data
+    sentences = [
+        {field: sentence.get(field) for field in fields}
+        for sentence in _sentences(transcript_data)
+    ]
+    return {"data": {"transcript": {"sentences": sentences}}}
+
+
+async def fetch_transcript(
+    transcript_id: str,
+    client: FirefliesClient,
+    cache: Optional[TranscriptCache] = None,
+    fields: Iterable[str] = SENTENCE_FIELDS,
+):
+    """
+    Fetches the transcript data from the API using the given transcript ID, requesting only the
+    given sentence fields. The result holds at least those fields; use project_transcript to drop
+    any others before returning it to a client.
+
+    Finished transcripts are immutable, so a cached copy is served when it holds every requested
+    field. Otherwise the missing fields are fetched together with the cached ones, so the refreshed
+    copy still serves earlier callers. Concurrent fetches of the same transcript and fields share
+    one request.
+    """
+    fields = normalize_fields(fields)
+    with track_stage("fetch"):
+        cached = None
+        if cache is not None:
+            cached = await cache.get(transcript_id)
+            if cached is not None:
+                cached_fields = _fetched_fields(cached)
+                if set(fields) <= set(cached_fields):
+                    return cached
+                fields = normalize_fields(fields + cached_fields)
+
+        transcript_data, _ = await transcript_flight.do(
+            (transcript_id, fields),
+            lambda: _fetch_and_cache(transcript_id, client, cache, fields),
         )
+        return transcript_data
+
+
+async def _fetch_and_cache(
+    transcript_id: str,
+    client: FirefliesClient,
+    cache: Optional[TranscriptCache],
+    fields: Tuple[str, ...],
+):
+    transcript_data = await client.execute(
+        transcript_query(fields), {"transcriptId": transcript_id}
+    )
+
+    # Fireflies answers an unknown transcript ID with 200 and a null transcript.
+    if not (transcript_data.get("data") or {}).get("transcript"):
+        raise HTTPException(status_code=404, detail="Transcript not found")
+    if cache is not None:
+        await cache.set(transcript_id, transcript_data)
+    return transcript_data
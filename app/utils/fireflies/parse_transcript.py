@@ -1,3 +1,22 @@
+import re
+
+from typing import Optional, Tuple
+from dataclasses import dataclass
+from app.config import config
+from app.utils.llm.tokens import count_tokens
+from app.utils.metrics.telemetry import timed_stage
+
+LEGEND_PREFIX = "Speakers: "
+
+# Sentence fields every rendering reads; markers add the field they print.
+RENDER_FIELDS = ("speaker_name", "text")
+
+FILLER_PATTERN = re.compile(
+    r"\b(?:u+m+|u+h+|e+r+m*|h+m+|m+h+m+|a+h+)\b[,.]?", re.IGNORECASE
+)
+
+
+@timed_stage("parse")
 def parse_transcript(transcript_data):
     """
     Parses transcript JSON data into a readable format maintaining the sequence of speakers.
@@ -13,3 +32,117 @@ def parse_transcript(transcript_data):
     readable_format = "\n".join(parsed_data)
 
     return readable_format
+
+
+@dataclass
+class CompactTranscript:
+    """
+    A compact transcript rendering along with the token savings over parse_transcript.
+    """
+
+    text: str
+    original_tokens: int
+    compact_tokens: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compact_tokens
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+
+@timed_stage("parse")
+def render_compact(
+    transcript_data,
+    strip_fillers: bool = False,
+    markers: Optional[str] = None,
+) -> str:
+    """
+    Renders transcript JSON data in a token-efficient format in a single pass over the sentences.
+
+    Consecutive sentences by the same speaker are merged into one turn, speakers are aliased to
+    short IDs listed in a one-line legend, whitespace is normalized and fillers are optionally
+    removed. markers may be "index" or "start_time" to prefix each sentence with a trace-back marker.
+    """
+    sentences = transcript_data["data"]["transcript"]["sentences"]
+    aliases = {}
+    turns = []
+    current_alias = None
+
+    for sentence in sentences:
+        speaker_name = sentence["speaker_name"]
+        text = sentence["text"] or ""
+
+        if strip_fillers:
+            text = FILLER_PATTERN.sub("", text)
+        text = " ".join(text.split())
+        if not text:
+            continue
+
+        if markers == "index":
+            text = f"[{sentence['index']}] {text}"
+        elif markers == "start_time":
+            text = f"[{sentence['start_time']:.1f}s] {text}"
+
+        alias = aliases.setdefault(speaker_name, f"S{len(aliases) + 1}")
+        if alias == current_alias:
+            turns[-1] += f" {text}"
+        else:
+            turns.append(f"{alias}: {text}")
+            current_alias = alias
+
+    legend = LEGEND_PREFIX + ", ".join(
+        f"{alias}={speaker_name}" for speaker_name, alias in aliases.items()
+    )
+    return "\n".join([legend, *turns])
+
+
+def parse_transcript_compact(
+    transcript_data,
+    strip_fillers: bool = False,
+    markers: Optional[str] = None,
+) -> CompactTranscript:
+    """
+    Renders transcript JSON data with render_compact and reports the token savings over
+    parse_transcript. Counting tokens costs more than rendering, so callers that only need the
+    text should use render_compact.
+    """
+    text = render_compact(transcript_data, strip_fillers=strip_fillers, markers=markers)
+    original_tokens = sum(
+        count_tokens(f"{sentence['speaker_name']}: {sentence['text'] or ''}") + 1
+        for sentence in transcript_data["data"]["transcript"]["sentences"]
+    )
+    return CompactTranscript(
+        text=text, original_tokens=original_tokens, compact_tokens=count_tokens(text)
+    )
+
+
+def render_fields(markers: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Returns the sentence fields a transcript must be fetched with to render it with the given markers.
+    """
+    return RENDER_FIELDS + ((markers,) if markers else ())
+
+
+def transcript_render_fields() -> Tuple[str, ...]:
+    """
+    Returns the sentence fields render_transcript needs under the current config.
+    """
+    if not config.compact_transcripts:
+        return RENDER_FIELDS
+    return render_fields(config.compact_markers)
+
+
+def render_transcript(transcript_data) -> str:
+    """
+    Renders a transcript for the LLM, using the compact format when enabled in the config.
+    """
+    if not config.compact_transcripts:
+        return parse_transcript(transcript_data)
+    return render_compact(
+        transcript_data,
+        strip_fillers=config.compact_strip_fillers,
+        markers=config.compact_markers,
+    )
@@ -0,0 +1,217 @@
+import time
+import sqlite3
+import asyncio
+import logging
+import threading
+
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from app.config import config
+from app.utils.fireflies.client import FirefliesClient
+
+logger = logging.getLogger(__name__)
+
+# Fireflies caps the page size of the transcripts query at 50.
+PAGE_SIZE = 50
+
+# Upper bound on pages per sync, so a backend that never returns a short page cannot loop forever.
+# A sync that reaches it saves where it stopped and the next sync resumes from there.
+MAX_SYNC_PAGES = 200
+
+TRANSCRIPTS_PAGE_QUERY = """
+query Transcripts($userId: String, $limit: Int, $skip: Int, $fromDate: DateTime) {
+    transcripts(user_id: $userId, limit: $limit, skip: $skip, fromDate: $fromDate) {
+        id
+        title
+        date
+        duration
+    }
+}"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    title TEXT,
+    date REAL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS transcripts_user_date ON transcripts (user_id, date DESC);
+CREATE TABLE IF NOT EXISTS sync_state (
+    user_id TEXT PRIMARY KEY,
+    last_date REAL,
+    synced_at REAL NOT NULL,
+    resume_skip INTEGER
+);
+"""
+
+
+class TranscriptIndex:
+    """
+    Local SQLite index of each user's transcript listing, kept current by incremental syncs.
+    All methods are blocking and meant to be called through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        columns = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(sync_state)")
+        }
+        if "resume_skip" not in columns:
+            # Indexes created before syncs could be resumed.
+            self._conn.execute("ALTER TABLE sync_state ADD COLUMN resume_skip INTEGER")
+        self._conn.commit()
+
+    def upsert(self, user_id: str, transcripts: List[dict]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO transcripts (id, user_id, title, date, duration) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        transcript["id"],
+                        user_id,
+                        transcript.get("title"),
+                        transcript.get("date"),
+                        transcript.get("duration"),
+                    )
+                    for transcript in transcripts
+                ],
+            )
+            self._conn.commit()
+
+    def sync_state(self, user_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_date, synced_at, resume_skip FROM sync_state WHERE user_id = ?",
+                (user_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def mark_synced(self, user_id: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (user_id, last_date, synced_at) "
+                "SELECT ?, MAX(date), ? FROM transcripts WHERE user_id = ?",
+                (user_id, time.time(), user_id),
+            )
+            self._conn.commit()
+
+    def save_sync_cursor(self, user_id: str, resume_skip: int):
+        """
+        Records an unfinished sync. last_date is left as it was, so the next sync pages through
+        the same range again from resume_skip instead of skipping the transcripts it never reached.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sync_state (user_id, last_date, synced_at, resume_skip) "
+                "VALUES (?, NULL, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+                "synced_at = excluded.synced_at, resume_skip = excluded.resume_skip",
+                (user_id, time.time(), resume_skip),
+            )
+            self._conn.commit()
+
+    def list(
+        self,
+        user_id: str,
+        limit: int,
+        skip: int,
+        from_date: Optional[float] = None,
+        to_date: Optional[float] = None,
+    ) -> Tuple[List[dict], int]:
+        """
+        Returns a page of the user's transcripts, newest first, and the total matching count.
+        Dates are epoch milliseconds, as returned by Fireflies.
+        """
+        where = "user_id = ?"
+        params = [user_id]
+        if from_date is not None:
+            where += " AND date >= ?"
+            params.append(from_date)
+        if to_date is not None:
+            where += " AND date <= ?"
+            params.append(to_date)
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM transcripts WHERE {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT id, title, date, duration FROM transcripts WHERE {where} "
+                "ORDER BY date DESC, id LIMIT ? OFFSET ?",
+                [*params, limit, skip],
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+
+async def sync_transcripts(
+    user_id: str, client: FirefliesClient, index: TranscriptIndex
+) -> int:
+    """
+    Pulls only the transcripts newer than the last sync into the index, resuming an unfinished
+    sync where it stopped. Returns the number of transcripts received from Fireflies.
+    """
+    state = await asyncio.to_thread(index.sync_state, user_id)
+    from_date = None
+    start = 0
+    if state:
+        if state["last_date"] is not None:
+            from_date = datetime.fromtimestamp(
+                state["last_date"] / 1000, tz=timezone.utc
+            ).isoformat()
+        start = state["resume_skip"] or 0
+
+    received = 0
+    seen_ids = set()
+    for page_number in range(MAX_SYNC_PAGES):
+        variables = {
+            "userId": user_id,
+            "limit": PAGE_SIZE,
+            "skip": start + page_number * PAGE_SIZE,
+        }
+        if from_date:
+            variables["fromDate"] = from_date
+        response = await client.execute(TRANSCRIPTS_PAGE_QUERY, variables)
+        page = (response.get("data") or {}).get("transcripts") or []
+
+        # A page with nothing new means the backend ignores skip and is repeating itself.
+        page_ids = {transcript["id"] for transcript in page}
+        if not page_ids - seen_ids:
+            break
+        seen_ids |= page_ids
+
+        await asyncio.to_thread(index.upsert, user_id, page)
+        received += len(page)
+        if len(page) < PAGE_SIZE:
+            break
+    else:
+        resume_skip = start + MAX_SYNC_PAGES * PAGE_SIZE
+        logger.warning(
+            "Transcript sync for %s stopped after %d pages; resuming at skip %d next time.",
+            user_id,
+            MAX_SYNC_PAGES,
+            resume_skip,
+        )
+        await asyncio.to_thread(index.save_sync_cursor, user_id, resume_skip)
+        return received
+
+    await asyncio.to_thread(index.mark_synced, user_id)
+    return received
+
+
+_index: Optional[TranscriptIndex] = None
+
+
+def init_transcript_index() -> TranscriptIndex:
+    global _index
+    _index = TranscriptIndex(config.transcript_index_path)
+    return _index
+
+
+def get_transcript_index() -> TranscriptIndex:
+    if _index is None:
+        raise RuntimeError("Transcript index is not initialized.")
+    return _index
@@ -0,0 +1,263 @@
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+from typing import List, Optional, Tuple
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    transcript_id TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE TABLE IF NOT EXISTS job_dedupe (
+    key TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class JobStore:
+    """
+    SQLite-backed persistent queue of extraction jobs and their stage-by-stage progress events.
+    All methods are blocking and meant to be called through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "heartbeat_at" not in columns:
+            # Queues created before jobs held a lease.
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+        self._conn.commit()
+
+    def _add_event(self, job_id: str, stage: str, now: float):
+        self._conn.execute(
+            "INSERT INTO job_events (job_id, seq, stage, created_at) "
+            "SELECT ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM job_events WHERE job_id = ?",
+            (job_id, stage, now, job_id),
+        )
+
+    def _insert(self, job_id: str, transcript_id: str, operation: str, now: float):
+        self._conn.execute(
+            "INSERT INTO jobs (id, transcript_id, operation, status, stage, created_at, updated_at) "
+            "VALUES (?, ?, ?, 'queued', 'queued', ?, ?)",
+            (job_id, transcript_id, operation, now, now),
+        )
+        self._add_event(job_id, "queued", now)
+
+    def submit(self, transcript_id: str, operation: str) -> dict:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._insert(job_id, transcript_id, operation, now)
+            self._conn.commit()
+        return self.get(job_id)
+
+    def _count_pending(self) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()[0]
+
+    def submit_once(
+        self,
+        dedupe_key: str,
+        transcript_id: str,
+        operation: str,
+        max_pending: Optional[int] = None,
+    ) -> Tuple[Optional[dict], bool]:
+        """
+        Submits a job unless a job that has not failed was already submitted under dedupe_key.
+        A failed job is replaced, so redeliveries can retry it. When max_pending jobs are already
+        queued or running, no job is submitted and None is returned.
+        Returns the job and whether it was newly created.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT jobs.id, jobs.status FROM job_dedupe "
+                "LEFT JOIN jobs ON jobs.id = job_dedupe.job_id WHERE job_dedupe.key = ?",
+                (dedupe_key,),
+            ).fetchone()
+            if row is not None and row["id"] is not None and row["status"] != "failed":
+                return self._get(row["id"]), False
+            if max_pending is not None and self._count_pending() >= max_pending:
+                return None, False
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_dedupe (key, job_id, created_at) "
+                "VALUES (?, ?, ?)",
+                (dedupe_key, job_id, now),
+            )
+            self._insert(job_id, transcript_id, operation, now)
+            self._conn.commit()
+        return self.get(job_id), True
+
+    def claim_next(self) -> Optional[dict]:
+        """
+        Marks the oldest queued job as running and returns it. The update only applies while the
+        job is still queued, so when several processes share the queue each job is claimed once.
+        """
+        now = time.time()
+        with self._lock:
+            while True:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return None
+                claimed = self._conn.execute(
+                    "UPDATE jobs SET status = 'running', stage = 'running', attempts = attempts + 1, "
+                    "updated_at = ?, heartbeat_at = ? WHERE id = ? AND status = 'queued'",
+                    (now, now, row["id"]),
+                ).rowcount
+                if claimed:
+                    break
+                # Another process claimed it between the select and the update.
+            self._add_event(row["id"], "running", now)
+            self._conn.commit()
+        return self.get(row["id"])
+
+    def heartbeat(self, job_id: str):
+        """
+        Renews the lease of a running job, so recover leaves it alone.
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running'",
+                (time.time(), job_id),
+            )
+            self._conn.commit()
+
+    def set_stage(self, job_id: str, stage: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET stage = ?, updated_at = ? WHERE id = ?",
+                (stage, now, job_id),
+            )
+            self._add_event(job_id, stage, now)
+            self._conn.commit()
+
+    def complete(self, job_id: str, result: dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'succeeded', stage = 'succeeded', result = ?, "
+                "error = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result), now, job_id),
+            )
+            self._add_event(job_id, "succeeded", now)
+            self._conn.commit()
+
+    def fail(self, job_id: str, error: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', stage = 'failed', error = ?, "
+                "updated_at = ? WHERE id = ?",
+                (error, now, job_id),
+            )
+            self._add_event(job_id, "failed", now)
+            self._conn.commit()
+
+    def requeue(self, job_id: str, error: str):
+        """
+        Puts a running job back in the queue after a transient failure, keeping the error.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', stage = 'queued', error = ?, "
+                "updated_at = ? WHERE id = ?",
+                (error, now, job_id),
+            )
+            self._add_event(job_id, "requeued", now)
+            self._conn.commit()
+
+    def recover(self, max_attempts: int, lease_seconds: float) -> int:
+        """
+        Requeues running jobs whose lease has not been renewed for lease_seconds, because the
+        process running them died, failing those out of attempts. Jobs still heartbeating in
+        another process are left alone. Returns the number of jobs requeued.
+        """
+        now = time.time()
+        expired = now - lease_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, attempts FROM jobs WHERE status = 'running' "
+                "AND COALESCE(heartbeat_at, updated_at) < ?",
+                (expired,),
+            ).fetchall()
+            requeued = 0
+            for row in rows:
+                if row["attempts"] >= max_attempts:
+                    status, error, stage = (
+                        "failed",
+                        "Exceeded maximum attempts.",
+                        "failed",
+                    )
+                else:
+                    status, error, stage = "queued", None, "requeued"
+                updated = self._conn.execute(
+                    "UPDATE jobs SET status = ?, stage = ?, error = COALESCE(?, error), "
+                    "updated_at = ? WHERE id = ? AND status = 'running' "
+                    "AND COALESCE(heartbeat_at, updated_at) < ?",
+                    (status, status, error, now, row["id"], expired),
+                ).rowcount
+                if not updated:
+                    # Renewed or finished since the select.
+                    continue
+                self._add_event(row["id"], stage, now)
+                requeued += status == "queued"
+            self._conn.commit()
+        return requeued
+
+    def _get(self, job_id: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._get(job_id)
+
+    def events_since(self, job_id: str, seq: int) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, stage, created_at FROM job_events WHERE job_id = ? AND seq > ? "
+                "ORDER BY seq",
+                (job_id, seq),
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,314 @@
+import random
+import asyncio
+
+from typing import Dict, Optional, Tuple
+from app.config import config
+from fastapi import HTTPException
+from app.utils.jobs.store import JobStore
+from app.utils.metrics.telemetry import current_endpoint
+from app.utils.llm.client import classify_openai_error
+from app.utils.fireflies.client import classify_fireflies_error, get_fireflies_client
+from app.utils.cache.transcript_cache import get_transcript_cache
+from app.utils.fireflies.fetch_messages import fetch_transcript
+from app.utils.fireflies.align_snippets import ALIGNMENT_FIELDS
+from app.utils.fireflies.parse_transcript import (
+    render_transcript,
+    transcript_render_fields,
+)
+from app.utils.fireflies.extraction_store import (
+    store_candidate_information,
+    store_cheat_sheet,
+)
+from app.utils.fireflies.extract_cheat_sheet import extract_cheat_sheet_async
+from app.utils.fireflies.extract_candidate_information import (
+    extract_candidate_information_async,
+)
+
+OPERATIONS = ("extract_information", "extract_cheat_sheet", "analyze")
+
+# How long a finished job's version is kept for event streams still catching up on it.
+FINISHED_VERSION_TTL_SECONDS = 60.0
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed job may succeed when run again, judged by the classifiers the upstreams
+    retry on. The Fireflies client raises HTTPException from the transport error, so its cause is
+    classified. Anything neither classifier retries, such as an unknown transcript, a prompt over
+    budget or a bug, is final.
+    """
+    cause = error.__cause__ if isinstance(error, HTTPException) else error
+    if cause is None:
+        return False
+    return (
+        classify_fireflies_error(cause) is not None
+        or classify_openai_error(cause) is not None
+    )
+
+
+class JobWorkerPool:
+    """
+    Runs queued extraction jobs from the JobStore on a fixed number of asyncio workers.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        workers: int,
+        max_attempts: int,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 1.0,
+    ):
+        self.store = store
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._wakeups: asyncio.Queue = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        # Bumped on every change to a job, so waiters can tell whether they missed one.
+        self._versions: Dict[str, int] = {}
+        self._tasks = []
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._recover()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, transcript_id: str, operation: str) -> dict:
+        job = await asyncio.to_thread(self.store.submit, transcript_id, operation)
+        self._wakeups.put_nowait(None)
+        await self._notify(job["id"])
+        return job
+
+    async def submit_once(
+        self,
+        dedupe_key: str,
+        transcript_id: str,
+        operation: str,
+        max_pending: Optional[int] = None,
+    ) -> Tuple[Optional[dict], bool]:
+        """
+        Submits a job unless a job that has not failed was already submitted under dedupe_key,
+        checking the backlog against max_pending in the same transaction (see JobStore.submit_once).
+        Returns the job, or None when the backlog is full, and whether it was newly created.
+        """
+        job, created = await asyncio.to_thread(
+            self.store.submit_once, dedupe_key, transcript_id, operation, max_pending
+        )
+        if created:
+            self._wakeups.put_nowait(None)
+            await self._notify(job["id"])
+        return job, created
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def events_since(self, job_id: str, seq: int):
+        return await asyncio.to_thread(self.store.events_since, job_id, seq)
+
+    def version(self, job_id: str) -> int:
+        """
+        Returns the job's change counter. Read it before reading the job, then pass it to
+        wait_for_change so a change landing in between is not missed.
+        """
+        return self._versions.get(job_id, 0)
+
+    async def wait_for_change(self, job_id: str, seen: int, timeout: float) -> bool:
+        """
+        Waits until the job's version differs from seen. Returns False if timeout elapsed first.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self.version(job_id) != seen),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def _notify(self, job_id: str, finished: bool = False):
+        async with self._changed:
+            self._versions[job_id] = self.version(job_id) + 1
+            self._changed.notify_all()
+        if finished:
+            asyncio.get_running_loop().call_later(
+                FINISHED_VERSION_TTL_SECONDS, self._versions.pop, job_id, None
+            )
+
+    async def _set_stage(self, job_id: str, stage: str):
+        await asyncio.to_thread(self.store.set_stage, job_id, stage)
+        await self._notify(job_id)
+
+    async def _fail_or_retry(self, job: dict, error: Exception, detail: str) -> bool:
+        """
+        Requeues a job after a transient error until it has run max_attempts times, waiting an
+        exponential backoff first; otherwise marks it failed. Returns whether it was requeued.
+        """
+        if not is_transient(error) or job["attempts"] >= self.max_attempts:
+            await asyncio.to_thread(self.store.fail, job["id"], detail)
+            return False
+
+        await self._set_stage(job["id"], "retrying")
+        await asyncio.sleep(
+            random.uniform(
+                0,
+                min(
+                    config.upstream_backoff_max_seconds,
+                    config.upstream_backoff_base_seconds * 2 ** job["attempts"],
+                ),
+            )
+        )
+        await asyncio.to_thread(self.store.requeue, job["id"], detail)
+        self._wakeups.put_nowait(None)
+        return True
+
+    async def _recover(self):
+        """
+        Requeues jobs whose lease expired, on startup and then once per lease, so jobs left
+        running by a crashed process are picked up by any process sharing the queue.
+        """
+        while True:
+            requeued = await asyncio.to_thread(
+                self.store.recover, self.max_attempts, self.lease_seconds
+            )
+            for _ in range(requeued):
+                self._wakeups.put_nowait(None)
+            await asyncio.sleep(self.lease_seconds)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(self.store.heartbeat, job_id)
+
+    async def _run(self, job: dict) -> bool:
+        """
+        Executes a claimed job and records its outcome. Returns whether it was requeued.
+        """
+        try:
+            result = await self._execute(job)
+        except HTTPException as e:
+            return await self._fail_or_retry(job, e, str(e.detail))
+        except Exception as e:
+            return await self._fail_or_retry(job, e, str(e))
+        await asyncio.to_thread(self.store.complete, job["id"], result)
+        return False
+
+    async def _work(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim_next)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeups.get(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._notify(job["id"])
+            # The lease is held through the retry backoff as well.
+            heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+            try:
+                requeued = await self._run(job)
+            finally:
+                heartbeat.cancel()
+            await self._notify(job["id"], finished=not requeued)
+
+    async def _execute(self, job: dict) -> dict:
+        job_id = job["id"]
+        operation = job["operation"]
+        current_endpoint.set(f"job:{operation}")
+
+        await self._set_stage(job_id, "fetch")
+        # The alignment fields too, so the cached copy a webhook job leaves behind also serves
+        # /extract-information and /analyze-transcript, which align snippets.
+        transcript_data = await fetch_transcript(
+            job["transcript_id"],
+            get_fireflies_client(),
+            get_transcript_cache(),
+            fields=transcript_render_fields() + ALIGNMENT_FIELDS,
+        )
+
+        await self._set_stage(job_id, "parse")
+        parsed_transcript = render_transcript(transcript_data)
+
+        async def extract(name, extractor, store):
+            await self._set_stage(job_id, name)
+            result = await extractor(parsed_transcript)
+            await store(job["transcript_id"], result.parsed)
+            await self._set_stage(job_id, f"{name}:done")
+            return result
+
+        if operation == "extract_information":
+            result = await extract(
+                operation,
+                extract_candidate_information_async,
+                store_candidate_information,
+            )
+            return {
+                "extracted_information": result.parsed.model_dump(mode="json"),
+                "model": result.model,
+                "estimated_cost": result.estimated_cost,
+                "cost": result.cost,
+            }
+
+        if operation == "extract_cheat_sheet":
+            result = await extract(
+                operation, extract_cheat_sheet_async, store_cheat_sheet
+            )
+            return {
+                "extracted_cheat_sheet": result.parsed.model_dump(mode="json"),
+                "model": result.model,
+                "estimated_cost": result.estimated_cost,
+                "cost": result.cost,
+            }
+
+        candidate, cheat_sheet = await asyncio.gather(
+            extract(
+                "extract_information",
+                extract_candidate_information_async,
+                store_candidate_information,
+            ),
+            extract(
+                "extract_cheat_sheet", extract_cheat_sheet_async, store_cheat_sheet
+            ),
+        )
+        return {
+            "extracted_information": candidate.parsed.model_dump(mode="json"),
+            "extracted_cheat_sheet": cheat_sheet.parsed.model_dump(mode="json"),
+            "estimated_cost": candidate.estimated_cost + cheat_sheet.estimated_cost,
+            "cost": candidate.cost + cheat_sheet.cost,
+        }
+
+
+_pool: Optional[JobWorkerPool] = None
+
+
+async def start_job_workers() -> JobWorkerPool:
+    global _pool
+    _pool = JobWorkerPool(
+        JobStore(config.job_db_path),
+        workers=config.job_workers,
+        max_attempts=config.job_max_attempts,
+        lease_seconds=config.job_lease_seconds,
+    )
+    await _pool.start()
+    return _pool
+
+
+def get_job_pool() -> JobWorkerPool:
+    if _pool is None:
+        raise RuntimeError("Job workers are not started.")
+    return _pool
+
+
+async def stop_job_workers():
+    global _pool
+    if _pool is not None:
+        await _pool.stop()
+        _pool = None
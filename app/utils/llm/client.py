@@ -0,0 +1,81 @@
+from app.config import config
+from typing import TYPE_CHECKING, Optional
+from app.utils.upstream import Retry, Upstream, parse_retry_after
+
+# The openai package takes most of the service's import time, so it is only imported once a
+# client is built; scripts and tests that never call the model do not pay for it.
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+_client: Optional["AsyncOpenAI"] = None
+_upstream: Optional[Upstream] = None
+
+
+def classify_openai_error(error: BaseException) -> Optional[Retry]:
+    """
+    Retries rate limits, server errors and connection failures. An exhausted quota is also
+    reported as 429 but will not clear on retry, so it is final.
+    """
+    import openai
+
+    if isinstance(error, openai.RateLimitError):
+        if error.code == "insufficient_quota":
+            return None
+        return Retry(
+            throttled=True, retry_after=parse_retry_after(error.response.headers)
+        )
+    if isinstance(error, openai.APIStatusError):
+        if error.status_code >= 500:
+            return Retry(retry_after=parse_retry_after(error.response.headers))
+        return None
+    if isinstance(error, openai.APIConnectionError):
+        return Retry()
+    return None
+
+
+def init_openai_client(**kwargs) -> "AsyncOpenAI":
+    """
+    Creates the process-wide async OpenAI client and the Upstream that rate-limits and retries its
+    completions. The SDK's own retries are disabled so that every attempt is budgeted.
+    """
+    from openai import AsyncOpenAI
+
+    global _client, _upstream
+    _client = AsyncOpenAI(
+        api_key=kwargs.pop("api_key", config.openai_api_key),
+        base_url=kwargs.pop("base_url", config.openai_base_url),
+        timeout=kwargs.pop("timeout", config.openai_timeout),
+        max_retries=0,
+        **kwargs,
+    )
+    _upstream = Upstream(
+        "openai",
+        classify_openai_error,
+        max_concurrency=config.openai_max_concurrency,
+        requests_per_minute=config.openai_requests_per_minute,
+        tokens_per_minute=config.openai_tokens_per_minute,
+        max_retries=config.upstream_max_retries,
+        backoff_base=config.upstream_backoff_base_seconds,
+        backoff_max=config.upstream_backoff_max_seconds,
+    )
+    return _client
+
+
+def get_openai_client() -> "AsyncOpenAI":
+    if _client is None:
+        raise RuntimeError("OpenAI client is not initialized.")
+    return _client
+
+
+def get_openai_upstream() -> Upstream:
+    if _upstream is None:
+        raise RuntimeError("OpenAI client is not initialized.")
+    return _upstream
+
+
+async def close_openai_client():
+    global _client, _upstream
+    if _client is not None:
+        await _client.close()
+        _client = None
+        _upstream = None
@@ -0,0 +1,192 @@
+import logging
+
+from typing import List, Optional, Type, TypeVar
+from dataclasses import dataclass, replace
+from fastapi import HTTPException
+from pydantic import BaseModel
+from app.config import config
+from app.utils.cost.compute import (
+    calculate_chat_completion_cost,
+    estimate_completion_cost,
+    get_cached_tokens,
+    log_cached_completion_cost,
+)
+from app.utils.cache.single_flight import SingleFlight
+from app.utils.metrics.telemetry import record_llm_usage, track_stage
+from app.utils.cache.result_cache import ResultCache, get_result_cache
+from app.utils.llm.preflight import count_message_tokens
+from app.utils.llm.client import get_openai_client, get_openai_upstream
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+@dataclass
+class CompletionResult:
+    """
+    The parsed output of a structured completion along with its usage, its actual cost and the
+    cost estimated before it was sent.
+    """
+
+    parsed: BaseModel
+    cost: float = 0.0
+    estimated_cost: float = 0.0
+    model: str = ""
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hit: bool = False
+    coalesced: bool = False
+
+
+# Identical completions already in flight are shared rather than sent again.
+completion_flight = SingleFlight()
+
+
+async def _run_completion(
+    messages: List[dict],
+    response_format: Type[BaseModel],
+    model: str,
+    cache: Optional[ResultCache],
+    cache_key: str,
+    estimated_tokens: int,
+    estimated_cost: float,
+) -> CompletionResult:
+    upstream = get_openai_upstream()
+    with track_stage("llm"):
+        completion = await upstream.call(
+            lambda: get_openai_client().beta.chat.completions.parse(
+                model=model,
+                messages=messages,
+                response_format=response_format,
+            ),
+            tokens=estimated_tokens,
+        )
+
+    usage = completion.usage
+    upstream.adjust_tokens(estimated_tokens, usage.total_tokens)
+    completion_cost = calculate_chat_completion_cost(usage, model)
+    parsed = completion.choices[0].message.parsed
+    if cache is not None and parsed is not None:
+        await cache.set(cache_key, parsed)
+
+    result = CompletionResult(
+        parsed=parsed,
+        cost=completion_cost,
+        estimated_cost=estimated_cost,
+        model=model,
+        prompt_tokens=usage.prompt_tokens,
+        cached_tokens=get_cached_tokens(usage),
+        completion_tokens=usage.completion_tokens,
+    )
+    record_llm_usage(
+        model,
+        result.prompt_tokens,
+        result.cached_tokens,
+        result.completion_tokens,
+        result.cost,
+    )
+    return result
+
+
+async def parse_completion(
+    messages: List[dict],
+    response_format: Type[BaseModel],
+    model: Optional[str] = None,
+    prompt_tokens: Optional[int] = None,
+) -> CompletionResult:
+    """
+    Runs a structured chat completion on the shared async client through the OpenAI Upstream.
+    Identical requests are answered from the result cache when it is enabled, and concurrent
+    identical requests share a single upstream call.
+
+    The prompt is counted and priced locally first, so a model without configured pricing fails
+    before anything is spent. Pass prompt_tokens when the messages were already counted, for
+    instance by plan_prompt, to skip counting them again.
+    """
+    model = model or config.gpt_model
+    estimated_tokens = prompt_tokens
+    if estimated_tokens is None:
+        estimated_tokens = count_message_tokens(messages, model)
+    estimated_cost = estimate_completion_cost(
+        model, estimated_tokens, config.estimated_completion_tokens
+    )
+    cache = get_result_cache()
+    cache_key = ResultCache.key_for(model, response_format, messages)
+    if cache is not None:
+        cached = await cache.get(cache_key, response_format)
+        if cached is not None:
+            result = CompletionResult(
+                parsed=cached,
+                cost=log_cached_completion_cost(model),
+                estimated_cost=estimated_cost,
+                model=model,
+                cache_hit=True,
+            )
+            record_llm_usage(model, 0, 0, 0, 0.0, outcome="result_cache_hit")
+            return result
+
+    result, shared = await completion_flight.do(
+        cache_key,
+        lambda: _run_completion(
+            messages,
+            response_format,
+            model,
+            cache,
+            cache_key,
+            estimated_tokens,
+            estimated_cost,
+        ),
+    )
+    if shared:
+        # The caller that started the call already accounts for its usage and cost.
+        return replace(
+            result,
+            cost=0.0,
+            estimated_cost=estimated_cost,
+            prompt_tokens=0,
+            cached_tokens=0,
+            completion_tokens=0,
+            coalesced=True,
+        )
+    return result
+
+
+def parsed_parts(parts: List[Optional[T]], operation: str) -> List[T]:
+    """
+    Drops the chunk outputs the model refused to produce, which parse as None.
+    Raises 502 when every chunk was refused, since there is nothing left to merge.
+    """
+    present = [part for part in parts if part is not None]
+    if not present:
+        raise HTTPException(
+            status_code=502, detail="The model refused every chunk of the transcript."
+        )
+    if len(present) < len(parts):
+        logger.warning(
+            "%s: the model refused %d of %d chunks; merging the rest.",
+            operation,
+            len(parts) - len(present),
+            len(parts),
+        )
+    return present
+
+
+def combine_results(
+    results: List[CompletionResult], parsed: BaseModel
+) -> CompletionResult:
+    """
+    Folds the usage and cost of several partial completions into one result carrying the merged output.
+    """
+    return CompletionResult(
+        parsed=parsed,
+        cost=sum(result.cost for result in results),
+        estimated_cost=sum(result.estimated_cost for result in results),
+        model=next((result.model for result in results if result.model), ""),
+        prompt_tokens=sum(result.prompt_tokens for result in results),
+        cached_tokens=sum(result.cached_tokens for result in results),
+        completion_tokens=sum(result.completion_tokens for result in results),
+        cache_hit=all(result.cache_hit for result in results),
+        coalesced=all(result.coalesced for result in results),
+    )
@@ -0,0 +1,57 @@
+from typing import List, Optional
+from dataclasses import dataclass
+from fastapi import HTTPException
+from app.config import config
+from app.utils.llm.tokens import count_tokens
+
+# Per-message framing the chat format adds around each message's content.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def count_message_tokens(messages: List[dict], model: Optional[str] = None) -> int:
+    """
+    Counts the prompt tokens of rendered chat messages locally, before they are sent.
+    """
+    return sum(
+        count_tokens(message["content"], model) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
+
+
+@dataclass
+class PromptPlan:
+    """
+    How a prompt of a given size is sent: the model it is routed to and whether it is chunked.
+    """
+
+    model: str
+    prompt_tokens: int
+    chunked: bool
+
+
+def plan_prompt(prompt_tokens: int, chunked: Optional[bool] = None) -> PromptPlan:
+    """
+    Routes a prompt by size. Prompts up to CHUNK_THRESHOLD_TOKENS go whole to the fast default
+    model. Longer ones go whole to LONG_CONTEXT_MODEL when it is set, and are chunked on the
+    default model otherwise. Prompts over MAX_PROMPT_TOKENS are chunked or, with
+    OVER_BUDGET_ACTION=reject, refused with 413 before anything is spent.
+    chunked forces or suppresses chunking on the default model, within the same budget.
+    """
+    if prompt_tokens > config.max_prompt_tokens:
+        if config.over_budget_action == "reject":
+            raise HTTPException(
+                status_code=413,
+                detail=(
+                    f"Prompt of {prompt_tokens} tokens exceeds the budget of "
+                    f"{config.max_prompt_tokens} tokens."
+                ),
+            )
+        return PromptPlan(config.gpt_model, prompt_tokens, True)
+
+    if chunked is not None:
+        return PromptPlan(config.gpt_model, prompt_tokens, chunked)
+    if prompt_tokens <= config.chunk_threshold_tokens:
+        return PromptPlan(config.gpt_model, prompt_tokens, False)
+    if config.long_context_model:
+        return PromptPlan(config.long_context_model, prompt_tokens, False)
+    return PromptPlan(config.gpt_model, prompt_tokens, True)
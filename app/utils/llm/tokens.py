@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import Optional
+from app.config import config
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a character heuristic
+    tiktoken = None
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Counts the tokens in text for the given model, or estimates roughly four characters per token
+    when tiktoken is not installed.
+    """
+    if tiktoken is None:
+        return (len(text) + 3) // 4
+    return len(_encoding(model or config.gpt_model).encode(text))
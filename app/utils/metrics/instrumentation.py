@@ -0,0 +1,30 @@
+from typing import Any
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from app.utils.metrics.telemetry import current_endpoint, track_stage
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
+
+async def track_endpoint(request: Request):
+    """
+    Router dependency attributing all work done for the request to its route template.
+    """
+    route = request.scope.get("route")
+    current_endpoint.set(getattr(route, "path", request.url.path))
+
+
+class TimedJSONResponse(JSONResponse):
+    """
+    JSONResponse that records the time spent serializing the body as the "serialize" stage.
+    Bodies are serialized with orjson when it is installed.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with track_stage("serialize"):
+            if orjson is None:
+                return super().render(content)
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,232 @@
+import time
+import threading
+
+from bisect import bisect_left
+from functools import wraps
+from contextvars import ContextVar
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# The endpoint a unit of work is attributed to; work outside a request counts as "background".
+current_endpoint: ContextVar[str] = ContextVar("current_endpoint", default="background")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(
+    names: Sequence[str], values: Tuple[str, ...], extra: str = ""
+) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def items(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            counts = self._counts.setdefault(labels, [0] * (len(self.buckets) + 1))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._sums[labels] = self._sums.get(labels, 0.0) + value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [
+                (labels, list(counts), self._sums[labels])
+                for labels, counts in self._counts.items()
+            ]
+
+        for labels, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            cumulative += counts[-1]
+            inf_labels = _format_labels(self.labelnames, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{inf_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+
+stage_duration = Histogram(
+    "fireflies_stage_duration_seconds",
+    "Latency of each pipeline stage (fetch, parse, llm, serialize).",
+    ["endpoint", "stage"],
+)
+llm_tokens = Counter(
+    "fireflies_llm_tokens_total",
+    "LLM tokens by kind (prompt, cached, completion).",
+    ["endpoint", "model", "kind"],
+)
+llm_cost = Counter(
+    "fireflies_llm_cost_dollars_total",
+    "Dollar cost of LLM calls.",
+    ["endpoint", "model"],
+)
+llm_requests = Counter(
+    "fireflies_llm_requests_total",
+    "LLM requests by outcome (upstream, result_cache_hit).",
+    ["endpoint", "model", "outcome"],
+)
+
+upstream_retries = Counter(
+    "fireflies_upstream_retries_total",
+    "Retried upstream calls by reason (throttled, error).",
+    ["upstream", "reason"],
+)
+
+
+@contextmanager
+def track_stage(stage: str):
+    """
+    Records the wall time of the enclosed block in the stage latency histogram.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_duration.observe(
+            time.perf_counter() - start, current_endpoint.get(), stage
+        )
+
+
+def timed_stage(stage: str):
+    """
+    Decorator form of track_stage for synchronous functions.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_llm_usage(
+    model: str,
+    prompt_tokens: int,
+    cached_tokens: int,
+    completion_tokens: int,
+    cost: float,
+    outcome: str = "upstream",
+):
+    endpoint = current_endpoint.get()
+    llm_requests.inc(endpoint, model, outcome)
+    llm_tokens.inc(endpoint, model, "prompt", amount=prompt_tokens)
+    llm_tokens.inc(endpoint, model, "cached", amount=cached_tokens)
+    llm_tokens.inc(endpoint, model, "completion", amount=completion_tokens)
+    llm_cost.inc(endpoint, model, amount=cost)
+
+
+def prompt_cache_stats() -> Dict[str, dict]:
+    """
+    Returns LLM requests, result cache hits, prompt and cached tokens and the cached-token ratio
+    per endpoint, summed over models.
+    """
+    stats: Dict[str, dict] = {}
+
+    def entry(endpoint: str) -> dict:
+        return stats.setdefault(
+            endpoint,
+            {
+                "requests": 0,
+                "result_cache_hits": 0,
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+            },
+        )
+
+    for (endpoint, _, outcome), count in llm_requests.items():
+        entry(endpoint)["requests"] += int(count)
+        if outcome == "result_cache_hit":
+            entry(endpoint)["result_cache_hits"] += int(count)
+    for (endpoint, _, kind), tokens in llm_tokens.items():
+        if kind in ("prompt", "cached"):
+            entry(endpoint)[f"{kind}_tokens"] += int(tokens)
+
+    for endpoint_stats in stats.values():
+        prompt_tokens = endpoint_stats["prompt_tokens"]
+        endpoint_stats["cached_ratio"] = (
+            endpoint_stats["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        )
+    return stats
+
+
+def _render_cached_ratio() -> Iterator[str]:
+    name = "fireflies_llm_cached_token_ratio"
+    yield f"# HELP {name} Share of prompt tokens served from the provider prefix cache."
+    yield f"# TYPE {name} gauge"
+    for (endpoint, model, kind), prompt in llm_tokens.items():
+        if kind != "prompt" or not prompt:
+            continue
+        ratio = llm_tokens.value(endpoint, model, "cached") / prompt
+        yield f"{name}{_format_labels(('endpoint', 'model'), (endpoint, model))} {ratio}"
+
+
+def render_metrics() -> str:
+    """
+    Renders every metric in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in (
+        stage_duration,
+        llm_tokens,
+        llm_cost,
+        llm_requests,
+        upstream_retries,
+    ):
+        lines.extend(metric.render())
+    lines.extend(_render_cached_ratio())
+    return "\n".join(lines) + "\n"
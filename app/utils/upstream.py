@@ -0,0 +1,212 @@
+import time
+import random
+import asyncio
+
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Mapping, Optional, TypeVar
+from app.utils.metrics.telemetry import upstream_retries
+
+T = TypeVar("T")
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Reads the server's requested delay in seconds from retry-after-ms or Retry-After, which may
+    hold either a number of seconds or an HTTP date.
+    """
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds:
+        try:
+            return max(float(milliseconds) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class Retry:
+    """
+    How to retry a failed upstream call. throttled marks a rate-limit response, which also
+    shrinks the concurrency limit; retry_after is the delay the server asked for, if any.
+    """
+
+    throttled: bool = False
+    retry_after: Optional[float] = None
+
+
+class TokenBucket:
+    """
+    Continuously refilling budget of rate_per_minute units, bursting up to one minute's worth.
+    A rate of zero disables the bucket.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        if now > self._updated:
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate_per_minute / 60,
+            )
+            self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        """
+        Waits until amount units are available and takes them. Waiters are served in order.
+        """
+        if not self.rate_per_minute:
+            return
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                paused = self._updated - time.monotonic()
+                if paused > 0:
+                    await asyncio.sleep(paused)
+                    continue
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) * 60 / self.rate_per_minute)
+
+    def adjust(self, amount: float):
+        """
+        Takes amount more units (or returns them if negative) once the actual cost of a call is known.
+        The balance may go negative, which delays the following calls.
+        """
+        if not self.rate_per_minute:
+            return
+        self._refill()
+        self._tokens = min(self._tokens - amount, self.capacity)
+
+    def pause(self, seconds: float):
+        """
+        Stops handing out units for the given number of seconds, e.g. after a Retry-After.
+        """
+        if not self.rate_per_minute:
+            return
+        self._refill()
+        self._updated = max(self._updated, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrency:
+    """
+    Limits in-flight calls with additive-increase/multiplicative-decrease: the limit grows by one
+    per limit's worth of successes and halves on throttling, at most once per cooldown.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, cooldown: float = 1.0):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.cooldown = cooldown
+        self.limit = float(max_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+
+    def on_throttle(self):
+        now = time.monotonic()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(self.limit / 2, float(self.min_limit))
+            self._last_decrease = now
+
+
+class Upstream:
+    """
+    Shared call path to a rate-limited upstream: request and token buckets, adaptive concurrency
+    and retries with exponential backoff and full jitter that honour the server's Retry-After.
+
+    classify maps an exception raised by a call to a Retry, or to None when it must not be retried.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        classify: Callable[[BaseException], Optional[Retry]],
+        max_concurrency: int,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.name = name
+        self.classify = classify
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def _delay(self, attempt: int, retry: Retry) -> float:
+        if retry.retry_after is not None:
+            return retry.retry_after + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def call(self, fn: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """
+        Runs fn within the limits, retrying retryable failures. tokens is the estimated token cost
+        of the call; use adjust_tokens to settle the difference once the actual usage is known.
+        """
+        attempt = 0
+        while True:
+            await self.requests.acquire()
+            if tokens:
+                await self.tokens.acquire(tokens)
+
+            async with self.concurrency.slot():
+                try:
+                    result = await fn()
+                except Exception as e:
+                    retry = self.classify(e)
+                    if retry is None or attempt >= self.max_retries:
+                        raise
+                else:
+                    self.concurrency.on_success()
+                    return result
+
+            delay = self._delay(attempt, retry)
+            if retry.throttled:
+                self.concurrency.on_throttle()
+                self.requests.pause(delay)
+            upstream_retries.inc(self.name, "throttled" if retry.throttled else "error")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def adjust_tokens(self, estimated: int, actual: int):
+        self.tokens.adjust(actual - estimated)
@@ -0,0 +1,150 @@
+"""
+Cold-start benchmark for the service.
+
+Imports app.main in fresh interpreters with -X importtime and reports the median wall time of the
+import, the slowest modules and top-level packages by import time, and the time the lifespan takes
+to start up and shut down.
+
+    python -m benchmarks.cold_start --runs 5 --top 15
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import app.main
+print(time.perf_counter() - start)
+"""
+
+LIFESPAN_SCRIPT = """
+import json
+import time
+import asyncio
+from app.main import app
+
+async def main():
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        started = time.perf_counter()
+    print(json.dumps({"startup": started - start, "shutdown": time.perf_counter() - started}))
+
+asyncio.run(main())
+"""
+
+
+def _run(script: str, env: dict, cwd: str, importtime: bool = False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    result = subprocess.run(
+        command + ["-c", script],
+        env=env,
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout, result.stderr
+
+
+def parse_importtime(output: str) -> dict:
+    """
+    Parses -X importtime output into {module: (self_us, cumulative_us)}.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|", 2)
+        modules[module.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def _ms(microseconds: float) -> float:
+    return round(microseconds / 1000, 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="Also write the report to this JSON file.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep every file the lifespan creates inside the scratch directory.
+        env = {
+            **os.environ,
+            "PYTHONPATH": ROOT,
+            "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "cold-start"),
+            "JOB_DB_PATH": os.path.join(workdir, "jobs.sqlite3"),
+            "TRANSCRIPT_INDEX_PATH": os.path.join(workdir, "transcripts.sqlite3"),
+            "EXTRACTION_STORE_PATH": os.path.join(workdir, "extractions.sqlite3"),
+            "RESULT_CACHE_PATH": os.path.join(workdir, "result_cache.sqlite3"),
+            "COST_LOG_DIR": os.path.join(workdir, "logs"),
+        }
+
+        import_seconds = []
+        module_runs = defaultdict(list)
+        for _ in range(args.runs):
+            stdout, stderr = _run(IMPORT_SCRIPT, env, workdir, importtime=True)
+            import_seconds.append(float(stdout.strip()))
+            for module, timings in parse_importtime(stderr).items():
+                module_runs[module].append(timings)
+
+        lifespans = [
+            json.loads(_run(LIFESPAN_SCRIPT, env, workdir)[0]) for _ in range(args.runs)
+        ]
+
+    modules = {
+        module: (
+            statistics.median(self_us for self_us, _ in runs),
+            statistics.median(cumulative_us for _, cumulative_us in runs),
+        )
+        for module, runs in module_runs.items()
+    }
+    packages = defaultdict(float)
+    for module, (self_us, _) in modules.items():
+        packages[module.split(".")[0]] += self_us
+
+    slowest = sorted(modules.items(), key=lambda item: -item[1][1])[: args.top]
+    report = {
+        "meta": {"runs": args.runs, "python": sys.version.split()[0]},
+        "import_app_main_ms": round(statistics.median(import_seconds) * 1000, 2),
+        "lifespan_startup_ms": round(
+            statistics.median(run["startup"] for run in lifespans) * 1000, 2
+        ),
+        "lifespan_shutdown_ms": round(
+            statistics.median(run["shutdown"] for run in lifespans) * 1000, 2
+        ),
+        "packages_self_ms": {
+            package: _ms(self_us)
+            for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[
+                : args.top
+            ]
+        },
+        "modules_cumulative_ms": {
+            module: {"self": _ms(self_us), "cumulative": _ms(cumulative_us)}
+            for module, (self_us, cumulative_us) in slowest
+        },
+    }
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
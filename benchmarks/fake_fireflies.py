@@ -0,0 +1,76 @@
+"""
+Local stand-in for the Fireflies GraphQL API.
+
+Transcript IDs of the form "bench-<sentences>-<anything>" return a synthetic transcript with that
+many sentences; any other ID returns FAKE_FIREFLIES_SENTENCES sentences (default 200). Like the
+real API, only the sentence fields selected in the query are returned, and transcript listings are
+returned newest first and honour limit, skip and fromDate.
+
+    uvicorn benchmarks.fake_fireflies:app --port 8101
+"""
+
+import os
+import re
+import asyncio
+
+from datetime import datetime
+
+from fastapi import FastAPI, Request
+from benchmarks.synthetic import synthetic_sentences
+
+DEFAULT_SENTENCES = int(os.environ.get("FAKE_FIREFLIES_SENTENCES", "200"))
+LATENCY_SECONDS = float(os.environ.get("FAKE_FIREFLIES_LATENCY_MS", "50")) / 1000
+TRANSCRIPT_COUNT = int(os.environ.get("FAKE_FIREFLIES_TRANSCRIPTS", "20"))
+
+SENTENCES_SELECTION = re.compile(r"sentences\s*\{([^}]*)\}")
+
+app = FastAPI(title="Fake Fireflies")
+
+
+def _sentence_count(transcript_id: str) -> int:
+    parts = transcript_id.split("-")
+    if len(parts) >= 2 and parts[0] == "bench" and parts[1].isdigit():
+        return int(parts[1])
+    return DEFAULT_SENTENCES
+
+
+@app.post("/graphql")
+async def graphql(request: Request):
+    body = await request.json()
+    query = body["query"]
+    variables = body.get("variables") or {}
+    await asyncio.sleep(LATENCY_SECONDS)
+
+    if "transcript(" in query:
+        transcript_id = variables["transcriptId"]
+        sentences = synthetic_sentences(_sentence_count(transcript_id), transcript_id)
+        selection = SENTENCES_SELECTION.search(query)
+        if selection:
+            fields = selection.group(1).split()
+            sentences = [
+                {field: sentence[field] for field in fields} for sentence in sentences
+            ]
+        return {"data": {"transcript": {"sentences": sentences}}}
+
+    if "transcripts(" in query:
+        transcripts = [
+            {
+                "id": f"bench-{DEFAULT_SENTENCES}-{index}",
+                "title": f"Synthetic interview {index}",
+                "date": 1_700_000_000_000 + index * 86_400_000,
+            }
+            for index in reversed(range(TRANSCRIPT_COUNT))
+        ]
+        if variables.get("fromDate"):
+            from_ms = datetime.fromisoformat(variables["fromDate"]).timestamp() * 1000
+            transcripts = [t for t in transcripts if t["date"] >= from_ms]
+        skip = variables.get("skip") or 0
+        limit = variables.get("limit") or 50
+        return {"data": {"transcripts": transcripts[skip : skip + limit]}}
+
+    if "users" in query:
+        return {
+            "data": {"users": [{"name": "Benchmark User", "user_id": "bench-user"}]}
+        }
+
+    return {"errors": [{"message": "Unsupported query in fake Fireflies server."}]}
@@ -0,0 +1,121 @@
+"""
+Local stand-in for the OpenAI chat completions API returning schema-valid structured outputs.
+
+The response schema is chosen from the json_schema name in response_format, so CandidateInfo and
+CheatSheet requests receive payloads that parse into the app's models.
+
+    uvicorn benchmarks.fake_openai:app --port 8102
+"""
+
+import os
+import json
+import time
+import asyncio
+
+from fastapi import FastAPI, Request
+from app.utils.fireflies.extract_cheat_sheet import (
+    MainCategory,
+    generic_questions,
+    industry_specific_questions,
+)
+
+LATENCY_SECONDS = float(os.environ.get("FAKE_OPENAI_LATENCY_MS", "500")) / 1000
+COMPLETION_TOKENS = int(os.environ.get("FAKE_OPENAI_COMPLETION_TOKENS", "400"))
+
+app = FastAPI(title="Fake OpenAI")
+
+SNIPPET = "I have been working at the Grand Plaza hotel for three years."
+
+
+def _field(value):
+    return {"value": value, "snippet": SNIPPET if value else None}
+
+
+def candidate_info_payload() -> dict:
+    return {
+        "name": _field("Jane Doe"),
+        "position": _field("Front Office Supervisor"),
+        "age": _field(None),
+        "desired_salary": _field("15,000 AED"),
+        "current_salary": _field("12,000 AED"),
+        "desired_position": _field("Front Office Manager"),
+        "desired_company": _field("Luxury hospitality"),
+        "desired_location": _field("Dubai"),
+        "personality_assessment": _field("Confident and well spoken."),
+        "date_of_birth": _field(None),
+        "basic_summary": _field("Hotel front office professional seeking promotion."),
+        "pitched_jobs": [{"role": _field("Front Office Manager, luxury resort")}],
+        "notice_period": _field("1 month"),
+        "contact_preference": _field("WhatsApp"),
+        "additional_info": [],
+    }
+
+
+def cheat_sheet_payload() -> dict:
+    def evaluate(main_category, questions):
+        return {
+            "main_category": main_category.value,
+            "subcategories": [
+                {
+                    "category_name": subcategory.value,
+                    "questions": [
+                        {
+                            "question": question,
+                            "is_answered": index % 2 == 0,
+                            "answer_summary": (
+                                "Answered in the interview." if index % 2 == 0 else None
+                            ),
+                        }
+                        for index, question in enumerate(subcategory_questions)
+                    ],
+                }
+                for subcategory, subcategory_questions in questions.items()
+            ],
+        }
+
+    return {
+        "evaluations": [
+            evaluate(MainCategory.INDUSTRY_SPECIFIC, industry_specific_questions),
+            evaluate(MainCategory.GENERIC, generic_questions),
+        ]
+    }
+
+
+PAYLOADS = {
+    "CandidateInfo": candidate_info_payload,
+    "CheatSheet": cheat_sheet_payload,
+}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    schema_name = body["response_format"]["json_schema"]["name"]
+    prompt_chars = sum(
+        len(message.get("content") or "") for message in body["messages"]
+    )
+    prompt_tokens = prompt_chars // 4
+    await asyncio.sleep(LATENCY_SECONDS)
+
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body["model"],
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {
+                    "role": "assistant",
+                    "content": json.dumps(PAYLOADS[schema_name]()),
+                },
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": COMPLETION_TOKENS,
+            "total_tokens": prompt_tokens + COMPLETION_TOKENS,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
@@ -0,0 +1,285 @@
+"""
+Load driver for the Fireflies router.
+
+Starts the fake Fireflies and OpenAI servers plus the service itself on local ports, drives every
+route with a fixed concurrency and writes p50/p95/p99 latency and throughput to a JSON file.
+
+    python -m benchmarks.load --sentences 10 500 5000 --requests 50 --concurrency 10
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+
+import httpx
+
+ROUTE_PREFIX = "/api/v1/fireflies"
+
+
+def _transcript_body(transcript_id: str) -> dict:
+    return {"transcriptId": transcript_id}
+
+
+# (method, path, body builder taking a unique transcript ID or None)
+ROUTES = [
+    ("GET", "/health-check", None),
+    ("POST", "/get-user", None),
+    ("POST", "/get-transcriptions", lambda _: {"userId": "bench-user"}),
+    ("POST", "/list-transcriptions", lambda _: {"userId": "bench-user", "limit": 10}),
+    ("POST", "/get-transcription-messages", _transcript_body),
+    ("POST", "/parse-transcript", _transcript_body),
+    ("POST", "/extract-information", _transcript_body),
+    ("POST", "/extract-cheat-sheet", _transcript_body),
+    ("POST", "/analyze-transcript", _transcript_body),
+    (
+        "POST",
+        "/align-snippets",
+        lambda transcript_id: {
+            "transcriptId": transcript_id,
+            "snippets": ["The hotel has around four hundred rooms."],
+        },
+    ),
+    (
+        "POST",
+        "/batch-extract-information",
+        lambda transcript_id: {
+            "transcriptIds": [f"{transcript_id}-{index}" for index in range(3)]
+        },
+    ),
+    ("GET", "/transcript-cache/stats", None),
+    ("GET", "/result-cache/stats", None),
+    ("GET", "/prompt-cache/stats", None),
+    ("DELETE", "/transcript-cache/{transcript_id}", None),
+]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(module: str, port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            module,
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=env,
+    )
+
+
+async def _wait_until_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not start within {timeout}s.")
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def run_route(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    build_body,
+    sentences: int,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    run_id = time.time_ns()
+
+    async def one(index: int):
+        nonlocal errors
+        transcript_id = f"bench-{sentences}-{run_id}-{index}"
+        url = ROUTE_PREFIX + path.format(transcript_id=transcript_id)
+        body = build_body(transcript_id) if build_body else None
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                await response.aread()
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "method": method,
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    processes = []
+    service_url = args.service_url
+    # Keeps every file the service's lifespan creates out of the working tree.
+    workdir = tempfile.TemporaryDirectory()
+
+    try:
+        if service_url is None:
+            fireflies_port, openai_port, service_port = (
+                _free_port(),
+                _free_port(),
+                _free_port(),
+            )
+            fake_env = {
+                **os.environ,
+                "OPENAI_API_KEY": "bench",
+                "FAKE_FIREFLIES_LATENCY_MS": str(args.fireflies_latency_ms),
+                "FAKE_OPENAI_LATENCY_MS": str(args.openai_latency_ms),
+            }
+            service_env = {
+                **fake_env,
+                "FIREFLIES_API_KEY": "bench",
+                "FIREFLIES_URL": f"http://127.0.0.1:{fireflies_port}/graphql",
+                "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+                # The fakes have no rate limits, so only the service itself is measured.
+                "FIREFLIES_REQUESTS_PER_MINUTE": "0",
+                "OPENAI_REQUESTS_PER_MINUTE": "0",
+                "OPENAI_TOKENS_PER_MINUTE": "0",
+                "JOB_DB_PATH": os.path.join(workdir.name, "jobs.sqlite3"),
+                "TRANSCRIPT_INDEX_PATH": os.path.join(
+                    workdir.name, "transcripts.sqlite3"
+                ),
+                "EXTRACTION_STORE_PATH": os.path.join(
+                    workdir.name, "extractions.sqlite3"
+                ),
+                "RESULT_CACHE_PATH": os.path.join(workdir.name, "result_cache.sqlite3"),
+                "COST_LOG_DIR": os.path.join(workdir.name, "logs"),
+            }
+            if not args.warm_caches:
+                service_env["RESULT_CACHE_BACKEND"] = "none"
+                service_env["TRANSCRIPT_CACHE_MAX_BYTES"] = "0"
+
+            processes.append(
+                _start_server("benchmarks.fake_fireflies:app", fireflies_port, fake_env)
+            )
+            processes.append(
+                _start_server("benchmarks.fake_openai:app", openai_port, fake_env)
+            )
+            processes.append(_start_server("app.main:app", service_port, service_env))
+            service_url = f"http://127.0.0.1:{service_port}"
+
+        await _wait_until_ready(f"{service_url}/docs")
+
+        results = {}
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(
+            base_url=service_url, timeout=args.timeout, limits=limits
+        ) as client:
+            for sentences in args.sentences:
+                size_results = results.setdefault(str(sentences), {})
+                for method, path, build_body in ROUTES:
+                    size_results[path] = await run_route(
+                        client,
+                        method,
+                        path,
+                        build_body,
+                        sentences,
+                        args.requests,
+                        args.concurrency,
+                    )
+                    print(
+                        f"{sentences:>5} sentences {method:<6} {path}: {size_results[path]}"
+                    )
+        return results
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        workdir.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, nargs="+", default=[10, 500, 5000])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--fireflies-latency-ms", type=float, default=50)
+    parser.add_argument("--openai-latency-ms", type=float, default=500)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument(
+        "--warm-caches",
+        action="store_true",
+        help="Keep the transcript and result caches enabled in the service.",
+    )
+    parser.add_argument(
+        "--service-url",
+        help="Benchmark an already running service instead of starting one.",
+    )
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "requests_per_route": args.requests,
+            "concurrency": args.concurrency,
+            "fireflies_latency_ms": args.fireflies_latency_ms,
+            "openai_latency_ms": args.openai_latency_ms,
+            "warm_caches": args.warm_caches,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
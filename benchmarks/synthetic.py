@@ -0,0 +1,50 @@
+import random
+
+SPEAKERS = ["Recruiter", "Candidate"]
+
+PHRASES = [
+    "I have been working at the Grand Plaza hotel for three years.",
+    "The hotel has around four hundred rooms.",
+    "I currently work in the front office department.",
+    "My current salary is twelve thousand dirhams per month, net.",
+    "I am looking for a front office manager role next.",
+    "My notice period is one month.",
+    "I would prefer to relocate to Dubai.",
+    "So, what have you done so far in your job search?",
+    "Um, I applied to a couple of places through LinkedIn.",
+    "Can you tell me a bit more about your background?",
+    "I studied hospitality management at university.",
+    "We have a role at a luxury resort that might suit you.",
+    "Yes, I would be happy to apply to that position.",
+    "Great, I have your resume and will send it over today.",
+]
+
+
+def synthetic_sentences(sentence_count: int, seed: str) -> list:
+    """
+    Builds a deterministic synthetic interview with the given number of sentences.
+    """
+    rng = random.Random(seed)
+    sentences = []
+    speaker_index = 0
+    time = 0.0
+
+    for index in range(sentence_count):
+        if rng.random() < 0.4:
+            speaker_index = 1 - speaker_index
+        text = rng.choice(PHRASES)
+        duration = round(1.5 + rng.random() * 4, 2)
+        sentences.append(
+            {
+                "index": index,
+                "speaker_name": SPEAKERS[speaker_index],
+                "speaker_id": speaker_index,
+                "text": text,
+                "raw_text": text,
+                "start_time": round(time, 2),
+                "end_time": round(time + duration, 2),
+            }
+        )
+        time += duration
+
+    return sentences
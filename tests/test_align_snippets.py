@@ -0,0 +1,94 @@
+import pytest
+
+from app.utils.fireflies.align_snippets import AlignmentIndex, normalize_tokens
+
+SENTENCES = [
+    {"index": 0, "text": "Hi, thanks for joining.", "start_time": 0.0, "end_time": 2.0},
+    {
+        "index": 1,
+        "text": "I have worked at the Marriott for four years.",
+        "start_time": 2.0,
+        "end_time": 5.0,
+    },
+    {
+        "index": 2,
+        "text": "Before that I was at the Hilton in Dubai.",
+        "start_time": 5.0,
+        "end_time": 8.0,
+    },
+    {
+        "index": 3,
+        "text": "My notice period is one month.",
+        "start_time": 8.0,
+        "end_time": 10.0,
+    },
+]
+
+
+@pytest.fixture
+def index():
+    return AlignmentIndex(SENTENCES)
+
+
+def test_normalize_tokens():
+    assert normalize_tokens("It's the Hilton, in DUBAI!") == [
+        "it",
+        "s",
+        "the",
+        "hilton",
+        "in",
+        "dubai",
+    ]
+    assert normalize_tokens(None) == []
+
+
+def test_exact_snippet_resolves_to_its_sentence(index):
+    alignment = index.align("My notice period is one month.")
+    assert alignment == {
+        "verified": True,
+        "coverage": 1.0,
+        "start_index": 3,
+        "end_index": 3,
+        "start_time": 8.0,
+        "end_time": 10.0,
+    }
+
+
+def test_snippet_spanning_sentences(index):
+    alignment = index.align("Marriott for four years. Before that I was at the Hilton")
+    assert alignment["verified"]
+    assert (alignment["start_index"], alignment["end_index"]) == (1, 2)
+    assert (alignment["start_time"], alignment["end_time"]) == (2.0, 8.0)
+
+
+def test_snippet_ignores_case_and_punctuation(index):
+    alignment = index.align("before THAT i was at the hilton -- in dubai")
+    assert alignment["verified"]
+    assert alignment["start_index"] == 2
+
+
+def test_short_snippet_matches_single_words(index):
+    alignment = index.align("Hilton")
+    assert alignment["verified"]
+    assert alignment["start_index"] == 2
+
+
+def test_partial_snippet_is_not_verified(index):
+    alignment = index.align(
+        "I have worked at the Marriott and later ran the spa in Paris for a decade"
+    )
+    assert not alignment["verified"]
+    assert 0 < alignment["coverage"] < 0.6
+    assert alignment["start_index"] == 1
+
+
+def test_unmatched_snippet(index):
+    assert index.align("Completely unrelated words here") == {
+        "verified": False,
+        "coverage": 0.0,
+    }
+
+
+@pytest.mark.parametrize("snippet", [None, "", "!?"])
+def test_empty_snippet(index, snippet):
+    assert index.align(snippet) is None
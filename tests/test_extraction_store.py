@@ -0,0 +1,125 @@
+import pytest
+
+from app.utils.fireflies.extraction_store import (
+    ExtractionStore,
+    parse_notice_period_days,
+)
+from app.utils.fireflies.extract_cheat_sheet import CheatSheet
+from app.utils.fireflies.extract_candidate_information import CandidateInfo
+
+
+@pytest.mark.parametrize(
+    "notice_period, days",
+    [
+        ("2 weeks", 14.0),
+        ("one month", 30.0),
+        ("a week", 7.0),
+        ("3-month notice", 90.0),
+        ("seven days", 7.0),
+        ("nine weeks", 63.0),
+        ("eleven months", 330.0),
+        ("Immediately", 0.0),
+        ("Someone weeks", None),
+        ("Within 2 weekends", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_notice_period_days(notice_period, days):
+    assert parse_notice_period_days(notice_period) == days
+
+
+def _field(value):
+    return {"value": value, "snippet": None}
+
+
+def _candidate(**values) -> CandidateInfo:
+    fields = {name: _field(None) for name in CandidateInfo.model_fields}
+    fields.update(pitched_jobs=[], additional_info=[])
+    fields.update({name: _field(value) for name, value in values.items()})
+    return CandidateInfo.model_validate(fields)
+
+
+def _cheat_sheet(question: str, is_answered: bool) -> CheatSheet:
+    return CheatSheet.model_validate(
+        {
+            "evaluations": [
+                {
+                    "main_category": "Generic Questions",
+                    "subcategories": [
+                        {
+                            "category_name": "Job Search",
+                            "questions": [
+                                {
+                                    "question": question,
+                                    "is_answered": is_answered,
+                                    "answer_summary": None,
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ExtractionStore(str(tmp_path / "extractions.sqlite3"))
+    store.save_candidate(
+        "t1", _candidate(name="Jane Doe", desired_location="Abu Dhabi or Dubai")
+    )
+    store.save_candidate("t2", _candidate(name="John Smith", desired_location="Doha"))
+    # Saving again replaces the row and its full-text entry.
+    store.save_candidate(
+        "t1", _candidate(name="Jane Doe", desired_location="Abu Dhabi or Dubai")
+    )
+    store.save_cheat_sheet(
+        "t1", _cheat_sheet("What have they done so far in their search?", True)
+    )
+    store.save_cheat_sheet("t2", _cheat_sheet("How has that worked for them?", False))
+    return store
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({"desired_location": "dubai"}, ["t1"]),
+        ({"desired_location": "dub"}, ["t1"]),
+        ({"desired_location": "abu dhabi"}, ["t1"]),
+        ({"desired_location": "do"}, ["t2"]),
+        ({"name": "jane", "desired_location": "doha"}, []),
+        ({"name": '"--'}, []),
+        ({}, ["t1", "t2"]),
+    ],
+)
+def test_search_candidates(store, filters, expected):
+    candidates, total = store.search_candidates(10, 0, **filters)
+    assert sorted(candidate["transcript_id"] for candidate in candidates) == expected
+    assert total == len(expected)
+
+
+def test_search_questions(store):
+    questions, _ = store.search_questions(10, 0, question="search")
+    assert [question["transcript_id"] for question in questions] == ["t1"]
+    questions, _ = store.search_questions(10, 0, is_answered=False)
+    assert [question["transcript_id"] for question in questions] == ["t2"]
+
+
+@pytest.mark.parametrize(
+    "query, params",
+    [
+        (
+            "SELECT rowid FROM candidates WHERE rowid IN "
+            "(SELECT rowid FROM candidates_fts WHERE candidates_fts MATCH ?)",
+            ('desired_location : ("dub"*)',),
+        ),
+        ("SELECT rowid FROM cheat_sheet_questions WHERE is_answered = ?", (1,)),
+    ],
+)
+def test_filters_use_indexes(store, query, params):
+    plan = store._conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    assert not any(row[-1].startswith("SCAN cheat_sheet_questions") for row in plan)
+    assert not any(row[-1].startswith("SCAN candidates ") for row in plan)
+    assert plan[0][-1].startswith("SEARCH")
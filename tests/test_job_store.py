@@ -0,0 +1,120 @@
+import time
+import sqlite3
+
+from app.utils.jobs.store import JobStore
+
+
+def _expire_lease(path, job_id: str, seconds: float = 3600):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "UPDATE jobs SET heartbeat_at = heartbeat_at - ? WHERE id = ?",
+        (seconds, job_id),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_claim_next_takes_oldest_queued_job(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    first = store.submit("t1", "analyze")
+    second = store.submit("t2", "analyze")
+
+    claimed = store.claim_next()
+    assert claimed["id"] == first["id"]
+    assert claimed["status"] == "running"
+    assert claimed["attempts"] == 1
+    assert claimed["heartbeat_at"] is not None
+    assert store.claim_next()["id"] == second["id"]
+    assert store.claim_next() is None
+
+
+def test_claim_next_claims_each_job_once_across_connections(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    a, b = JobStore(path), JobStore(path)
+    job = a.submit("t", "analyze")
+
+    assert a.claim_next()["id"] == job["id"]
+    assert b.claim_next() is None
+    assert [event["stage"] for event in b.events_since(job["id"], 0)] == [
+        "queued",
+        "running",
+    ]
+
+
+def test_recover_requeues_only_expired_leases(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    live = store.submit("live", "analyze")
+    dead = store.submit("dead", "analyze")
+    store.claim_next()
+    store.claim_next()
+    _expire_lease(path, dead["id"])
+
+    assert JobStore(path).recover(max_attempts=3, lease_seconds=60) == 1
+    assert store.get(live["id"])["status"] == "running"
+    assert store.get(dead["id"])["status"] == "queued"
+    assert store.claim_next()["id"] == dead["id"]
+
+
+def test_heartbeat_renews_lease(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    job = store.submit("t", "analyze")
+    store.claim_next()
+    _expire_lease(path, job["id"])
+
+    store.heartbeat(job["id"])
+    assert store.recover(max_attempts=3, lease_seconds=60) == 0
+    assert store.get(job["id"])["status"] == "running"
+
+
+def test_recover_fails_jobs_out_of_attempts(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    store = JobStore(path)
+    job = store.submit("t", "analyze")
+    store.claim_next()
+    _expire_lease(path, job["id"])
+
+    assert store.recover(max_attempts=1, lease_seconds=60) == 0
+    failed = store.get(job["id"])
+    assert failed["status"] == "failed"
+    assert failed["error"] == "Exceeded maximum attempts."
+
+
+def test_requeued_job_keeps_error_until_it_succeeds(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job = store.submit("t", "analyze")
+    store.claim_next()
+    store.requeue(job["id"], "throttled")
+    assert store.get(job["id"])["error"] == "throttled"
+
+    assert store.claim_next()["attempts"] == 2
+    store.complete(job["id"], {"ok": True})
+    done = store.get(job["id"])
+    assert done["status"] == "succeeded"
+    assert done["error"] is None
+    assert done["result"] == {"ok": True}
+
+
+def test_adds_lease_column_to_existing_queue(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, transcript_id TEXT NOT NULL, "
+        "operation TEXT NOT NULL, status TEXT NOT NULL, stage TEXT, "
+        "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+        "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO jobs VALUES ('old', 't', 'analyze', 'running', 'running', 1, "
+        "NULL, NULL, ?, ?)",
+        (time.time() - 3600, time.time() - 3600),
+    )
+    conn.commit()
+    conn.close()
+
+    store = JobStore(path)
+    assert store.get("old")["heartbeat_at"] is None
+    # Without a heartbeat, the lease runs from the last update.
+    assert store.recover(max_attempts=3, lease_seconds=60) == 1
+    assert store.get("old")["status"] == "queued"
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+
+from app.utils.cache.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert [result for result, _ in results] == [1, 1, 1]
+    assert [shared for _, shared in results] == [False, True, True]
+    assert flight.in_flight() == 0
+
+
+def test_distinct_keys_and_later_calls_run_again():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0)
+        return key
+
+    async def run():
+        await asyncio.gather(
+            flight.do("a", lambda: fetch("a")), flight.do("b", lambda: fetch("b"))
+        )
+        await flight.do("a", lambda: fetch("a"))
+
+    asyncio.run(run())
+    assert calls == ["a", "b", "a"]
+
+
+def test_error_propagates_to_every_caller():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fail():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    errors = asyncio.run(run())
+    assert calls == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert flight.in_flight() == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_run():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flight.do("key", fetch))
+        second = asyncio.create_task(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == ("done", True)
@@ -0,0 +1,191 @@
+import time
+import asyncio
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from app.utils.upstream import (
+    AdaptiveConcurrency,
+    Retry,
+    TokenBucket,
+    Upstream,
+    parse_retry_after,
+)
+
+
+@pytest.mark.parametrize(
+    "headers, seconds",
+    [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after": "3"}, 3.0),
+        ({"retry-after": "-2"}, 0.0),
+        ({"retry-after-ms": "soon", "retry-after": "4"}, 4.0),
+        ({"retry-after-ms": "250", "retry-after": "4"}, 0.25),
+        ({"retry-after": "soon"}, None),
+        ({}, None),
+    ],
+)
+def test_parse_retry_after(headers, seconds):
+    assert parse_retry_after(headers) == seconds
+
+
+def test_parse_retry_after_http_date():
+    at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = parse_retry_after({"retry-after": format_datetime(at, usegmt=True)})
+    assert seconds == pytest.approx(30, abs=2)
+
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after({"retry-after": format_datetime(past, usegmt=True)}) == 0
+
+
+def test_token_bucket_refills_at_rate_up_to_capacity():
+    bucket = TokenBucket(60)
+    bucket._tokens = 0.0
+    bucket._updated -= 30
+    bucket._refill()
+    assert bucket._tokens == pytest.approx(30, abs=0.5)
+
+    bucket._updated -= 600
+    bucket._refill()
+    assert bucket._tokens == 60
+
+
+def test_token_bucket_waits_for_refill():
+    async def drain_then_acquire():
+        bucket = TokenBucket(6000)
+        await bucket.acquire(6000)
+        started = time.monotonic()
+        await bucket.acquire(10)
+        return time.monotonic() - started
+
+    # 10 units at 100 per second.
+    assert 0.08 <= asyncio.run(drain_then_acquire()) < 1
+
+
+def test_token_bucket_adjust_and_pause_delay_acquire():
+    async def run():
+        bucket = TokenBucket(6000)
+        bucket.adjust(6000 + 10)
+        assert bucket._tokens == pytest.approx(-10, abs=1)
+        bucket.pause(0.1)
+        started = time.monotonic()
+        await bucket.acquire(1)
+        return time.monotonic() - started
+
+    assert 0.1 <= asyncio.run(run()) < 1
+
+
+def test_token_bucket_zero_rate_is_disabled():
+    bucket = TokenBucket(0)
+    asyncio.run(bucket.acquire(10**9))
+    bucket.adjust(10**9)
+    bucket.pause(60)
+    asyncio.run(bucket.acquire(1))
+
+
+def test_adaptive_concurrency_halves_on_throttle_down_to_min():
+    concurrency = AdaptiveConcurrency(8, min_limit=2, cooldown=0)
+    concurrency.on_throttle()
+    assert concurrency.limit == 4
+    concurrency.on_throttle()
+    concurrency.on_throttle()
+    assert concurrency.limit == 2
+
+
+def test_adaptive_concurrency_throttle_cooldown():
+    concurrency = AdaptiveConcurrency(8, cooldown=60)
+    concurrency.on_throttle()
+    concurrency.on_throttle()
+    assert concurrency.limit == 4
+
+
+def test_adaptive_concurrency_grows_by_one_per_limit_of_successes():
+    concurrency = AdaptiveConcurrency(8, cooldown=0)
+    concurrency.on_throttle()
+    for _ in range(4):
+        concurrency.on_success()
+    assert 4.9 < concurrency.limit <= 5
+
+    for _ in range(100):
+        concurrency.on_success()
+    assert concurrency.limit == 8
+
+
+def test_adaptive_concurrency_slot_caps_in_flight():
+    concurrency = AdaptiveConcurrency(2)
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        async with concurrency.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run():
+        await asyncio.gather(*(call() for _ in range(6)))
+
+    asyncio.run(run())
+    assert peak == 2
+
+
+class Throttled(Exception):
+    pass
+
+
+def _classify(error):
+    if isinstance(error, Throttled):
+        return Retry(throttled=True, retry_after=0.1)
+    return None
+
+
+def test_upstream_delay_honours_retry_after():
+    upstream = Upstream("test", _classify, 4, backoff_base=0.5)
+    for attempt in range(5):
+        assert 2.0 <= upstream._delay(attempt, Retry(retry_after=2.0)) <= 2.5
+        assert 0 <= upstream._delay(attempt, Retry()) <= 0.5 * 2**attempt
+
+
+def test_upstream_retries_throttled_call_after_retry_after():
+    upstream = Upstream("test", _classify, 4, requests_per_minute=6000)
+    attempts = []
+
+    async def fn():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise Throttled()
+        return "ok"
+
+    assert asyncio.run(upstream.call(fn)) == "ok"
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 0.1
+    # Halved by the throttle, then grown by the success.
+    assert upstream.concurrency.limit == 2 + 1 / 2
+
+
+def test_upstream_raises_final_and_exhausted_errors():
+    upstream = Upstream("test", _classify, 4, max_retries=2, backoff_base=0)
+    calls = 0
+
+    async def final():
+        nonlocal calls
+        calls += 1
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        asyncio.run(upstream.call(final))
+    assert calls == 1
+
+    calls = 0
+
+    async def throttled():
+        nonlocal calls
+        calls += 1
+        raise Throttled()
+
+    upstream.classify = lambda error: Retry()
+    with pytest.raises(Throttled):
+        asyncio.run(upstream.call(throttled))
+    assert calls == 3